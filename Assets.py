@@ -0,0 +1,134 @@
+import os
+import pickle
+import random
+from contextlib import nullcontext
+from functools import cached_property
+
+# Bump when Mesh/Starfield layout changes so old caches are rebuilt
+ASSET_VERSION = 3
+FONT_FILE = "Y224-2vdae.ttf"
+SHIP_FILE = "ship.obj"
+
+
+class AssetCache:
+    # Pickled, precomputed assets on disk
+    # Each entry stores the key it was built from; a key mismatch
+    # (different parameters, edited source file) rebuilds it.
+    def __init__(self, cache_dir=".asset_cache", enabled=True):
+        self.cache_dir = cache_dir
+        self.enabled = enabled
+
+    def get(self, name, key, build):
+        if not self.enabled:
+            return build()
+
+        path = os.path.join(self.cache_dir, name + ".pkl")
+        key = (ASSET_VERSION, key)
+        try:
+            with open(path, 'rb') as f:
+                stored_key, value = pickle.load(f)
+            if stored_key == key:
+                return value
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError,
+                ImportError, KeyError, TypeError, ValueError):
+            pass  # Missing or stale cache entry: rebuild below
+
+        value = build()
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Write then rename, so parallel launches never read half a file
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, 'wb') as f:
+                pickle.dump((key, value), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        except OSError:
+            pass  # Read-only checkout: just don't cache
+        return value
+
+
+def file_key(path):
+    # Cache key for an asset built from a file
+    try:
+        stat = os.stat(path)
+        return (path, stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        return (path, None, None)
+
+
+class Assets:
+    # Scene assets, each built (or loaded from the cache) on first use
+    # Runs that never render (headless) never pay for any of them.
+    def __init__(self, cache=None, timer=None, star_seed=None, num_stars=1500):
+        self.cache = cache if cache is not None else AssetCache()
+        self.timer = timer
+
+        # The sky seed is fixed up front, so it is known (for checkpoints)
+        # without building the stars. Random skies aren't worth caching.
+        self.cache_sky = star_seed is not None
+        self.star_seed = star_seed if star_seed is not None else random.randrange(2**32)
+        self.num_stars = num_stars
+
+    def use_starfield(self, seed, num_stars):
+        # Switch to another sky (e.g. from a checkpoint); rebuilt lazily
+        if (seed, num_stars) == (self.star_seed, self.num_stars):
+            return
+        self.star_seed = seed
+        self.num_stars = num_stars
+        self.cache_sky = True
+        self.__dict__.pop('starfield', None)  # Drop the cached_property value
+
+    def _phase(self, name):
+        # Startup timing for each asset, if a timer was given
+        if self.timer is None:
+            return nullcontext()
+        return self.timer.phase(name)
+
+    # --- MESHES ---
+
+    @cached_property
+    def mesh_ship(self):
+        from ObjectLoader import ObjectLoader
+        with self._phase("ship mesh"):
+            return self.cache.get("ship", file_key(SHIP_FILE),
+                                  lambda: ObjectLoader.load_obj(SHIP_FILE))
+
+    @cached_property
+    def mesh_planet(self):
+        from Mesh import Mesh
+        # Resolution (25x25)
+        with self._phase("planet mesh"):
+            return self.cache.get("planet_sphere", ('sphere', 1.0, 25, 25),
+                                  lambda: Mesh.make_sphere(radius=1.0, rings=25, sectors=25))
+
+    @cached_property
+    def mesh_arrow(self):
+        from Mesh import Mesh
+        with self._phase("arrow mesh"):
+            return self.cache.get("arrow_pyramid", ('pyramid', 0.5, 2.0),
+                                  lambda: Mesh.make_pyramid(base_size=0.5, height=2.0))
+
+    # --- SKY ---
+
+    @cached_property
+    def starfield(self):
+        from Space import Starfield
+        with self._phase("starfield"):
+            if not self.cache_sky:
+                return Starfield(num_stars=self.num_stars, seed=self.star_seed)
+            return self.cache.get(
+                "starfield", (self.star_seed, self.num_stars),
+                lambda: Starfield(num_stars=self.num_stars, seed=self.star_seed))
+
+    # --- FONTS (need pygame.font initialised) ---
+
+    @cached_property
+    def hud_font(self):
+        import pygame
+        with self._phase("hud font"):
+            return pygame.font.Font(FONT_FILE, 25)
+
+    @cached_property
+    def small_font(self):
+        import pygame
+        with self._phase("small font"):
+            return pygame.font.Font(FONT_FILE, 11)
@@ -0,0 +1,189 @@
+import array
+import math
+
+# Triangles per leaf: below this a split costs more than it saves
+LEAF_SIZE = 4
+EPSILON = 1e-9
+
+
+class BVH:
+    # Bounding volume hierarchy over one Mesh's triangles (model space)
+    # Stored as flat arrays so it pickles compactly with the mesh:
+    #   bounds[6 * n : 6 * n + 6]  node box (min x/y/z, max x/y/z)
+    #   first[n], count[n]         leaf: tri_order[first : first + count]
+    #                              inner (count 0): children n + 1 and first[n]
+    #   tris[9 * k : 9 * k + 9]    triangle k as v0, edge1, edge2
+    # Hits report the index into mesh.triangles.
+    def __init__(self):
+        self.bounds = array.array('d')
+        self.first = array.array('i')
+        self.count = array.array('i')
+        self.tri_order = array.array('i')
+        self.tris = array.array('d')
+
+    @staticmethod
+    def build(mesh):
+        bvh = BVH()
+        tris = bvh.tris
+        centroids = []
+        boxes = []
+        for tri in mesh.triangles:
+            p0, p1, p2 = tri.p
+            tris.extend((p0.x, p0.y, p0.z,
+                         p1.x - p0.x, p1.y - p0.y, p1.z - p0.z,
+                         p2.x - p0.x, p2.y - p0.y, p2.z - p0.z))
+            xs = (p0.x, p1.x, p2.x)
+            ys = (p0.y, p1.y, p2.y)
+            zs = (p0.z, p1.z, p2.z)
+            boxes.append((min(xs), min(ys), min(zs), max(xs), max(ys), max(zs)))
+            centroids.append((sum(xs) / 3.0, sum(ys) / 3.0, sum(zs) / 3.0))
+
+        if boxes:
+            bvh._build_node(list(range(len(boxes))), boxes, centroids)
+        return bvh
+
+    def _build_node(self, indices, boxes, centroids):
+        # Depth first, so the left child is always the next node
+        node = len(self.first)
+        box = [math.inf, math.inf, math.inf, -math.inf, -math.inf, -math.inf]
+        for k in indices:
+            b = boxes[k]
+            for axis in range(3):
+                if b[axis] < box[axis]:
+                    box[axis] = b[axis]
+                if b[axis + 3] > box[axis + 3]:
+                    box[axis + 3] = b[axis + 3]
+        self.bounds.extend(box)
+        self.first.append(0)
+        self.count.append(0)
+
+        if len(indices) <= LEAF_SIZE:
+            self.first[node] = len(self.tri_order)
+            self.count[node] = len(indices)
+            self.tri_order.extend(indices)
+            return node
+
+        # Median split on the axis where the centroids spread the most
+        spread = []
+        for axis in range(3):
+            values = [centroids[k][axis] for k in indices]
+            spread.append(max(values) - min(values))
+        axis = spread.index(max(spread))
+        indices.sort(key=lambda k: centroids[k][axis])
+        mid = len(indices) // 2
+
+        self._build_node(indices[:mid], boxes, centroids)
+        self.first[node] = self._build_node(indices[mid:], boxes, centroids)
+        return node
+
+    # --- QUERIES ---
+
+    def intersect(self, origin, direction, t_max=math.inf, any_hit=False):
+        # Nearest hit along origin + t * direction, 0 < t < t_max
+        # Returns (t, triangle index) or None. Both sides of a triangle
+        # count as hits. any_hit stops at the first hit found (occlusion).
+        if not self.first:
+            return None
+        ox, oy, oz = origin.x, origin.y, origin.z
+        dx, dy, dz = direction.x, direction.y, direction.z
+        # Slab test with 1/d; zero components become huge, not errors
+        ix = 1.0 / dx if dx else math.copysign(math.inf, dx)
+        iy = 1.0 / dy if dy else math.copysign(math.inf, dy)
+        iz = 1.0 / dz if dz else math.copysign(math.inf, dz)
+
+        bounds = self.bounds
+        first = self.first
+        count = self.count
+        order = self.tri_order
+        tris = self.tris
+
+        best_t = t_max
+        best_tri = -1
+        stack = [0]
+        while stack:
+            node = stack.pop()
+
+            # --- Ray vs node box ---
+            b = node * 6
+            t1 = (bounds[b] - ox) * ix
+            t2 = (bounds[b + 3] - ox) * ix
+            t_near = t1 if t1 < t2 else t2
+            t_far = t2 if t1 < t2 else t1
+            t1 = (bounds[b + 1] - oy) * iy
+            t2 = (bounds[b + 4] - oy) * iy
+            if t1 > t2:
+                t1, t2 = t2, t1
+            if t1 > t_near:
+                t_near = t1
+            if t2 < t_far:
+                t_far = t2
+            t1 = (bounds[b + 2] - oz) * iz
+            t2 = (bounds[b + 5] - oz) * iz
+            if t1 > t2:
+                t1, t2 = t2, t1
+            if t1 > t_near:
+                t_near = t1
+            if t2 < t_far:
+                t_far = t2
+            # NaN (origin on a slab plane with d == 0) fails every test
+            if not (t_near <= t_far and t_far > 0.0 and t_near < best_t):
+                continue
+
+            n = count[node]
+            if n == 0:
+                stack.append(first[node])
+                stack.append(node + 1)
+                continue
+
+            # --- Ray vs leaf triangles (Moller-Trumbore) ---
+            for k in order[first[node]:first[node] + n]:
+                j = k * 9
+                e1x, e1y, e1z = tris[j + 3], tris[j + 4], tris[j + 5]
+                e2x, e2y, e2z = tris[j + 6], tris[j + 7], tris[j + 8]
+                px = dy * e2z - dz * e2y
+                py = dz * e2x - dx * e2z
+                pz = dx * e2y - dy * e2x
+                det = e1x * px + e1y * py + e1z * pz
+                if -EPSILON < det < EPSILON:
+                    continue  # Parallel to the triangle
+                inv_det = 1.0 / det
+                sx = ox - tris[j]
+                sy = oy - tris[j + 1]
+                sz = oz - tris[j + 2]
+                u = (sx * px + sy * py + sz * pz) * inv_det
+                if u < 0.0 or u > 1.0:
+                    continue
+                qx = sy * e1z - sz * e1y
+                qy = sz * e1x - sx * e1z
+                qz = sx * e1y - sy * e1x
+                v = (dx * qx + dy * qy + dz * qz) * inv_det
+                if v < 0.0 or u + v > 1.0:
+                    continue
+                t = (e2x * qx + e2y * qy + e2z * qz) * inv_det
+                if EPSILON < t < best_t:
+                    best_t = t
+                    best_tri = k
+                    if any_hit:
+                        return best_t, best_tri
+
+        if best_tri < 0:
+            return None
+        return best_t, best_tri
+
+    def intersect_many(self, rays, t_max=math.inf, any_hit=False):
+        # Batched queries: rays is [(origin, direction), ...]
+        # Returns one (t, triangle index) or None per ray, in order
+        intersect = self.intersect
+        return [intersect(origin, direction, t_max, any_hit)
+                for origin, direction in rays]
+
+    # --- SERIALIZATION (Asset cache) ---
+
+    def __getstate__(self):
+        return {name: getattr(self, name).tobytes()
+                for name in ('bounds', 'first', 'count', 'tri_order', 'tris')}
+
+    def __setstate__(self, state):
+        self.__init__()
+        for name, raw in state.items():
+            getattr(self, name).frombytes(raw)
@@ -1,6 +1,5 @@
 from MatrixMath import Vector3, Matrix4
 import math
-import pygame
 
 
 class Camera:
@@ -28,17 +27,9 @@ class Camera:
 
         dist = self.follow_distance
 
-        # 2. CALCULATE 3D FORWARD VECTOR
-        rad_yaw = math.radians(self.yaw)
-        rad_pitch = math.radians(self.pitch)
-
-        # Rotate a forward vector (0,0,1) by Pitch(X) then Yaw(Y)
-        # x = sin(yaw) * cos(pitch)
-        # y = -sin(pitch)
-        # z = cos(yaw) * cos(pitch)
-        fx = math.sin(rad_yaw) * math.cos(rad_pitch)
-        fy = -math.sin(rad_pitch)
-        fz = math.cos(rad_yaw) * math.cos(rad_pitch)
+        # 2. FORWARD VECTOR (cached by the target's attitude)
+        forward = target.forward
+        fx, fy, fz = forward.x, forward.y, forward.z
 
         # 3. SET POSITION
         self.pos.x = target.pos.x - (fx * dist)
@@ -46,6 +37,8 @@ class Camera:
         self.pos.z = target.pos.z - (fz * dist)
 
     def update(self, keys, mouse_delta):
+        # pygame is only needed for key codes (see Spacecraft.update)
+        import pygame
         # 1. ROTATION
         dx, dy = mouse_delta
         sensitivity = 0.2
@@ -0,0 +1,146 @@
+import struct
+import time
+from MatrixMath import Vector3
+
+# --- FILE FORMAT ---
+# One fixed-size little endian record (see LAYOUT)
+# Version 2 appends the ship roll; version 1 files load with roll 0
+MAGIC = b'RKTCKPT\x00'
+VERSION = 2
+LAYOUT_V1 = struct.Struct(
+    '<8sH'    # magic, version
+    'qd'      # sim_step, sim_time
+    '3d3d2d'  # ship pos, vel, yaw/pitch
+    'B3d3d'   # camera mode, pos, yaw/pitch/follow_distance
+    'd'       # time_warp
+    'QI'      # starfield seed, star count
+)
+LAYOUT = struct.Struct(LAYOUT_V1.format + 'd')  # + ship roll
+CAMERA_MODES = ('chase', 'follow', 'free')
+
+
+class Checkpoint:
+    # Snapshot of everything needed to resume a run
+    def __init__(self):
+        self.sim_step = 0
+        self.sim_time = 0.0
+        self.ship_pos = Vector3()
+        self.ship_vel = Vector3()
+        self.ship_yaw = 0.0
+        self.ship_pitch = 0.0
+        self.ship_roll = 0.0
+        self.camera_mode = 'chase'
+        self.camera_pos = Vector3()
+        self.camera_yaw = 0.0
+        self.camera_pitch = 0.0
+        self.follow_distance = 15.0
+        self.time_warp = 1.0
+        self.star_seed = 0
+        self.num_stars = 0
+
+    @staticmethod
+    def capture(player, camera, star_seed, num_stars, time_warp, sim_step, sim_time):
+        ckpt = Checkpoint()
+        ckpt.sim_step = sim_step
+        ckpt.sim_time = sim_time
+        ckpt.ship_pos = Vector3(player.pos.x, player.pos.y, player.pos.z)
+        ckpt.ship_vel = Vector3(player.vel.x, player.vel.y, player.vel.z)
+        ckpt.ship_yaw = player.yaw
+        ckpt.ship_pitch = player.pitch
+        ckpt.ship_roll = player.roll
+        ckpt.camera_mode = camera.mode
+        ckpt.camera_pos = Vector3(camera.pos.x, camera.pos.y, camera.pos.z)
+        ckpt.camera_yaw = camera.yaw
+        ckpt.camera_pitch = camera.pitch
+        ckpt.follow_distance = camera.follow_distance
+        ckpt.time_warp = time_warp
+        ckpt.star_seed = star_seed
+        ckpt.num_stars = num_stars
+        return ckpt
+
+    def restore(self, player, camera):
+        # Returns (time_warp, sim_step, sim_time); the caller owns those
+        player.pos = Vector3(self.ship_pos.x, self.ship_pos.y, self.ship_pos.z)
+        player.vel = Vector3(self.ship_vel.x, self.ship_vel.y, self.ship_vel.z)
+        player.set_euler(self.ship_yaw, self.ship_pitch, self.ship_roll)
+        camera.mode = self.camera_mode
+        camera.pos = Vector3(self.camera_pos.x, self.camera_pos.y, self.camera_pos.z)
+        camera.yaw = self.camera_yaw
+        camera.pitch = self.camera_pitch
+        camera.follow_distance = self.follow_distance
+        return self.time_warp, self.sim_step, self.sim_time
+
+    # --- SERIALIZATION ---
+
+    def to_bytes(self):
+        return LAYOUT.pack(
+            MAGIC, VERSION,
+            self.sim_step, self.sim_time,
+            self.ship_pos.x, self.ship_pos.y, self.ship_pos.z,
+            self.ship_vel.x, self.ship_vel.y, self.ship_vel.z,
+            self.ship_yaw, self.ship_pitch,
+            CAMERA_MODES.index(self.camera_mode),
+            self.camera_pos.x, self.camera_pos.y, self.camera_pos.z,
+            self.camera_yaw, self.camera_pitch, self.follow_distance,
+            self.time_warp,
+            self.star_seed, self.num_stars,
+            self.ship_roll)
+
+    @staticmethod
+    def from_bytes(data):
+        # Any bad file (truncated, corrupt, wrong version) is a ValueError
+        try:
+            magic, version = struct.unpack_from('<8sH', data)
+            if magic != MAGIC or version not in (1, VERSION):
+                raise ValueError("Not a checkpoint (or unsupported version)")
+            if version == 1:
+                values = LAYOUT_V1.unpack(data) + (0.0,)
+            else:
+                values = LAYOUT.unpack(data)
+        except struct.error as e:
+            raise ValueError(f"Truncated or corrupt checkpoint: {e}") from None
+
+        ckpt = Checkpoint()
+        (ckpt.sim_step, ckpt.sim_time,
+         px, py, pz, vx, vy, vz,
+         ckpt.ship_yaw, ckpt.ship_pitch,
+         mode,
+         cx, cy, cz,
+         ckpt.camera_yaw, ckpt.camera_pitch, ckpt.follow_distance,
+         ckpt.time_warp,
+         ckpt.star_seed, ckpt.num_stars,
+         ckpt.ship_roll) = values[2:]
+        ckpt.ship_pos = Vector3(px, py, pz)
+        ckpt.ship_vel = Vector3(vx, vy, vz)
+        if mode >= len(CAMERA_MODES):
+            raise ValueError(f"Corrupt checkpoint: unknown camera mode {mode}")
+        ckpt.camera_mode = CAMERA_MODES[mode]
+        ckpt.camera_pos = Vector3(cx, cy, cz)
+        return ckpt
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+    @staticmethod
+    def load(path):
+        with open(path, 'rb') as f:
+            return Checkpoint.from_bytes(f.read())
+
+
+def fast_forward(player, planet, time_warp, sim_step, sim_time, target_time, recorder=None):
+    # Step physics headless (no input, no rendering) up to target_time
+    # Returns the new (sim_step, sim_time)
+    start = time.perf_counter()
+    steps = 0
+    while sim_time < target_time:
+        player.step(planet, (), (0, 0), dt=time_warp, controls_enabled=False)
+        sim_step += 1
+        sim_time += time_warp / 60.0
+        steps += 1
+        if recorder:
+            recorder.record(sim_step, sim_time, player, time_warp, 0)
+
+    elapsed = time.perf_counter() - start
+    print(f"Fast-forward: {steps} steps to t={sim_time:.1f} s in {elapsed:.3f} s")
+    return sim_step, sim_time
@@ -0,0 +1,148 @@
+import argparse
+import multiprocessing
+import os
+import time
+
+# --- WORKER STATE ---
+# Each worker process builds its own scene once, then renders frames
+_worker = {}
+
+
+def _init_worker(telemetry_path, width, height, seed, camera_mode, follow_distance, show_vectors, out_dir):
+    # Headless SDL: no window, surfaces only
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+    from Assets import Assets
+    from Camera import Camera
+    from Pipeline import Pipeline
+    from Spacecraft import Spacecraft
+    from Space import Planet
+    from Replay import FlightReplay
+    from Scene import build_scene
+
+    # No pygame.init(): surfaces and image.save don't need it, and
+    # SDL's signal handlers would stop the pool from terminating workers
+    camera = Camera()
+    camera.mode = camera_mode
+    camera.follow_distance = follow_distance
+
+    # Meshes/stars come from the shared asset cache when it is warm
+    assets = Assets(star_seed=seed)
+    # Same scene as Main.py
+    planet = Planet(0, 7000, 0, 6371, 398600)
+    _worker.update(
+        pygame=pygame,
+        surface=pygame.Surface((width, height)),
+        pipeline=Pipeline(width, height),
+        camera=camera,
+        player=Spacecraft(0, 0, 0),
+        planet=planet,
+        scene=build_scene(planet, assets.mesh_planet, assets.mesh_ship),
+        starfield=assets.starfield,
+        mesh_arrow=assets.mesh_arrow,
+        replay=FlightReplay(telemetry_path),
+        show_vectors=show_vectors,
+        out_dir=out_dir,
+    )
+
+
+def _render_frame(job):
+    from Renderer import render_scene
+    frame, sim_time = job
+    w = _worker
+
+    replay = w['replay']
+    replay.seek(sim_time)
+    replay.apply(w['player'])
+
+    camera = w['camera']
+    if camera.mode == 'chase':
+        camera.chase(w['player'])
+    else:
+        # No mouse offline: follow keeps its current angles
+        camera.follow(w['player'], (0, 0))
+
+    surface = w['surface']
+    surface.fill((0, 0, 0))
+    render_scene(surface, w['pipeline'], camera, w['scene'], w['player'], w['planet'],
+                 w['starfield'], w['mesh_arrow'], w['show_vectors'])
+
+    path = os.path.join(w['out_dir'], f"frame_{frame:06d}.png")
+    w['pygame'].image.save(surface, path)
+    return path
+
+
+def export_frames(telemetry_path, out_dir, fps=30, speed=1.0, width=1000, height=800,
+                  workers=None, seed=None, camera_mode='chase', follow_distance=15.0,
+                  show_vectors=True, start=None, end=None):
+    # Render a recorded flight to numbered PNGs, one frame per 1/fps
+    # seconds of playback. Frames are split across a process pool, so
+    # export time scales with cores instead of wall-clock flight time.
+    # seed=None draws the sky stored in the telemetry file.
+    from Replay import FlightReplay
+
+    replay = FlightReplay(telemetry_path)
+    t0 = replay.start_time if start is None else start
+    t1 = replay.end_time if end is None else end
+    if seed is None:
+        seed = replay.star_seed
+    replay.close()
+
+    step = speed / fps
+    count = max(1, int((t1 - t0) / step) + 1)
+    jobs = [(k, t0 + k * step) for k in range(count)]
+
+    os.makedirs(out_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    print(f"Exporting {count} frames with {workers} workers -> {out_dir}")
+
+    begin = time.perf_counter()
+    pool = multiprocessing.Pool(
+        workers, initializer=_init_worker,
+        initargs=(telemetry_path, width, height, seed, camera_mode,
+                  follow_distance, show_vectors, out_dir))
+    try:
+        # imap keeps frame order; chunks cut IPC overhead
+        chunk = max(1, count // (workers * 8))
+        for done, _ in enumerate(pool.imap(_render_frame, jobs, chunksize=chunk), 1):
+            if done % 100 == 0 or done == count:
+                print(f"  {done}/{count} frames")
+        pool.close()
+    except BaseException:
+        pool.terminate()
+        raise
+    finally:
+        pool.join()
+
+    elapsed = time.perf_counter() - begin
+    print(f"Exported {count} frames in {elapsed:.1f} s ({count / elapsed:.1f} fps)")
+    return count
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Render a recorded flight to numbered PNG frames")
+    parser.add_argument("telemetry", help="telemetry file from Main.py --record")
+    parser.add_argument("out_dir", help="directory for frame_NNNNNN.png")
+    parser.add_argument("--fps", type=float, default=30)
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="playback speed (sim seconds per video second)")
+    parser.add_argument("--width", type=int, default=1000)
+    parser.add_argument("--height", type=int, default=800)
+    parser.add_argument("--workers", type=int,
+                        help="worker processes (default: all cores)")
+    parser.add_argument("--seed", type=int,
+                        help="starfield seed (default: the one recorded with the flight)")
+    parser.add_argument("--camera", choices=('chase', 'follow'), default='chase')
+    parser.add_argument("--distance", type=float, default=15.0,
+                        help="camera follow distance")
+    parser.add_argument("--no-vectors", action="store_true")
+    parser.add_argument("--start", type=float, help="first sim time to render")
+    parser.add_argument("--end", type=float, help="last sim time to render")
+    args = parser.parse_args()
+
+    export_frames(args.telemetry, args.out_dir, fps=args.fps, speed=args.speed,
+                  width=args.width, height=args.height, workers=args.workers,
+                  seed=args.seed, camera_mode=args.camera,
+                  follow_distance=args.distance, show_vectors=not args.no_vectors,
+                  start=args.start, end=args.end)
@@ -0,0 +1,137 @@
+from collections import OrderedDict
+import pygame
+
+
+class TextCache:
+    # LRU cache of rendered text surfaces
+    # Key: (font, text, color) -> Surface
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color):
+        key = (id(font), text, color)
+        surface = self.entries.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, True, color)
+        self.entries[key] = surface
+
+        # Evict least recently used
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return surface
+
+
+class HudField:
+    # A dynamic text field that only re-renders when its text changes
+    def __init__(self, font, color, pos, fmt):
+        self.font = font
+        self.color = color
+        self.pos = pos
+        self.fmt = fmt
+        self.text = None
+        self.surface = None
+
+    def update(self, cache, *values):
+        text = self.fmt.format(*values)
+        if text != self.text:
+            self.text = text
+            self.surface = cache.render(self.font, text, self.color)
+
+
+class HUD:
+    def __init__(self, width, height, font, small_font, cache_size=256):
+        self.width = width
+        self.height = height
+        self.font = font
+        self.small_font = small_font
+        self.cache = TextCache(max_entries=cache_size)
+
+        # --- DYNAMIC FIELDS ---
+        self.fields = {
+            'altitude': HudField(font, (255, 255, 0), (10, 10),
+                                 "Altitude: {:7.1f}  km"),
+            'speed': HudField(font, (255, 255, 0), (10, 35),
+                              "Speed: {:10.1f}  km/s"),
+            'time_warp': HudField(small_font, (255, 0, 255), (10, 135),
+                                  "Time Warp: {:.1f}x"),
+            'camera_mode': HudField(small_font, (255, 0, 0), (10, 160),
+                                    "Camera Mode: {}"),
+            'fps': HudField(font, (255, 255, 0), (width - 200, 10),
+                            "FPS: {}"),
+            'culled': HudField(small_font, (255, 255, 0), (width - 200, 40),
+                               "Culled: {}/{}"),
+            # Only shown in replay mode
+            'replay': HudField(small_font, (0, 255, 255), (10, 185),
+                               "Replay: {:8.1f} s  {:+.2f}x{}"),
+        }
+
+        # --- STATIC LAYERS (Rendered once) ---
+        red = (255, 0, 0)
+        self.controls_layer = self.build_layer([
+            ("W / S = Forward / Back", red, 0),
+            ("Mouse = Look", red, 18),
+            ("Q / E = Roll", red, 36),
+            ("C = Switch Camera", red, 54),
+            ("R / T / Y = Time Warp", red, 72),
+            ("V = Toggle Vectors", red, 90),
+            ("F5 / F9 = Quick Save / Load", red, 108),
+            ("Replay: Space / Arrows / [ ] / Home / End", red, 126),
+        ])
+        self.controls_pos = (10, height - 144)
+
+        self.legend_layer = self.build_layer([
+            ("VECTORS:", (255, 255, 255), 0),
+            ("VELOCITY", (0, 255, 0), 20),
+            ("GRAVITY", (255, 0, 0), 35),
+            ("HEADING", (255, 255, 0), 50),
+        ])
+        self.legend_pos = (900, 180)
+
+    def build_layer(self, lines):
+        # Pre-render a block of static text into one transparent surface
+        # lines: [(text, color, y_offset), ...]
+        rendered = [(self.small_font.render(text, True, color), y)
+                    for text, color, y in lines]
+
+        layer_w = max(s.get_width() for s, _ in rendered)
+        layer_h = max(y + s.get_height() for s, y in rendered)
+        layer = pygame.Surface((layer_w, layer_h), pygame.SRCALPHA)
+        for surface, y in rendered:
+            layer.blit(surface, (0, y))
+        return layer
+
+    def update(self, altitude, speed, time_warp, camera_mode, fps, replay=None, culled=None):
+        # Only fields whose formatted text changed get re-rendered
+        # replay: (time, speed, paused) while playing back a recording
+        # culled: (culled, tested) occlusion counts from the last frame
+        cache = self.cache
+        self.fields['altitude'].update(cache, altitude)
+        self.fields['speed'].update(cache, speed)
+        self.fields['time_warp'].update(cache, time_warp)
+        self.fields['camera_mode'].update(cache, camera_mode.upper())
+        self.fields['fps'].update(cache, fps)
+        if replay is not None:
+            replay_time, replay_speed, paused = replay
+            self.fields['replay'].update(cache, replay_time, replay_speed,
+                                         "  PAUSED" if paused else "")
+        if culled is not None:
+            self.fields['culled'].update(cache, *culled)
+
+    def draw(self, screen, show_legend=True):
+        # Returns the screen rects covered by the HUD
+        dirty = []
+        if show_legend:
+            dirty.append(screen.blit(self.legend_layer, self.legend_pos))
+        for field in self.fields.values():
+            if field.surface is not None:
+                dirty.append(screen.blit(field.surface, field.pos))
+        dirty.append(screen.blit(self.controls_layer, self.controls_pos))
+        return dirty
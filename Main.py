@@ -1,151 +1,195 @@
-import pygame
-from Mesh import Mesh
+import time
+_process_start = time.perf_counter()
+import argparse
+import gc
+import sys
+from contextlib import nullcontext
+from Profiler import StartupTimer, FrameMemoryProfiler, freeze_long_lived
 from Camera import Camera
-from Pipeline import Pipeline
 from Spacecraft import Spacecraft
-from ObjectLoader import ObjectLoader
-from Space import Starfield, Planet
-from MatrixMath import Vector3, Matrix4
+from Space import Planet
+from Assets import Assets, AssetCache
+from Telemetry import TelemetryRecorder, encode_controls
+from Replay import FlightReplay
+from Checkpoint import Checkpoint, fast_forward
+from MatrixMath import set_backend
+
+timer = StartupTimer(start=_process_start)
+timer.record("imports", time.perf_counter() - _process_start)
+
+# --- COMMAND LINE ---
+parser = argparse.ArgumentParser(description="3D Rocket Sim")
+mode_group = parser.add_mutually_exclusive_group()
+mode_group.add_argument("--record", metavar="PATH",
+                        help="record flight telemetry to PATH")
+mode_group.add_argument("--replay", metavar="PATH",
+                        help="play back a recorded flight instead of flying")
+parser.add_argument("--seed", type=int,
+                    help="starfield seed (random if omitted)")
+parser.add_argument("--load", metavar="PATH",
+                    help="resume from a saved checkpoint")
+parser.add_argument("--checkpoint", metavar="PATH", default="quicksave.ckpt",
+                    help="quick save/load file for F5 / F9")
+parser.add_argument("--fast-forward", metavar="SECONDS", type=float,
+                    help="step physics headless to this sim time before starting")
+parser.add_argument("--headless", action="store_true",
+                    help="no window: fast-forward, save --checkpoint and exit")
+parser.add_argument("--startup-report", action="store_true",
+                    help="print startup time per phase after the first frame")
+parser.add_argument("--no-asset-cache", action="store_true",
+                    help="always rebuild meshes/stars instead of using .asset_cache")
+parser.add_argument("--profile-gc", action="store_true",
+                    help="time GC pauses per generation, report on exit")
+parser.add_argument("--profile-memory", action="store_true",
+                    help="--profile-gc plus per-frame tracemalloc stats (slow)")
+parser.add_argument("--gc-freeze", action="store_true",
+                    help="gc.freeze() startup objects after the first frame")
+parser.add_argument("--gc-threshold", metavar="G0[,G1[,G2]]",
+                    type=lambda text: tuple(int(v) for v in text.split(",")),
+                    help="gc.set_threshold() values")
+parser.add_argument("--math-backend", choices=("auto", "numpy", "python"), default="python",
+                    help="batch vector math: pure Python (default) or NumPy (auto: if installed)")
+parser.add_argument("--dynamic-resolution", action="store_true",
+                    help="render the scene below native size when frames run slow")
+parser.add_argument("--target-fps", type=float, default=60.0,
+                    help="frame rate --dynamic-resolution tries to hold")
+parser.add_argument("--min-scale", type=float, default=0.5,
+                    help="lowest render scale for --dynamic-resolution")
+parser.add_argument("--max-scale", type=float, default=1.0,
+                    help="highest render scale for --dynamic-resolution")
+parser.add_argument("--smoothing", type=float, default=0.1,
+                    help="weight of the newest frame time (0-1) for --dynamic-resolution")
+args = parser.parse_args()
+if args.headless and args.replay:
+    parser.error("--headless cannot be combined with --replay")
+if args.seed is not None and not 0 <= args.seed < 2**32:
+    parser.error("--seed must be in [0, 2**32)")
+if args.target_fps <= 0:
+    parser.error("--target-fps must be positive")
+if not 0.0 < args.min_scale <= args.max_scale <= 1.0:
+    parser.error("need 0 < --min-scale <= --max-scale <= 1")
+if not 0.0 < args.smoothing <= 1.0:
+    parser.error("--smoothing must be in (0, 1]")
+
+# --- GC / ALLOCATION PROFILING ---
+if args.gc_threshold:
+    gc.set_threshold(*args.gc_threshold)
+mem_profiler = None
+if args.profile_gc or args.profile_memory:
+    mem_profiler = FrameMemoryProfiler(trace_allocations=args.profile_memory)
+    mem_profiler.start()
+
+# --- INIT SIM STATE (No rendering needed) ---
+with timer.phase("sim state"):
+    player = Spacecraft(0, 0, 0)
+    camera = Camera()
+    time_warp = 1.0
+    # Sim clock: one physics step at dt=1 is 1/60 s
+    sim_step = 0
+    sim_time = 0.0
+    recorder = None  # Opened once the sky is known (after --load)
+    replay = FlightReplay(args.replay) if args.replay else None
+    # Planet Info:
+    # 1 Unit = 1 kilometer
+    # Position (0, 7000, 0)
+    # Radius 6371 km
+    # μ = 398600 km^3 /s^2
+    planet = Planet(0, 7000, 0, 6371, 398600)
+
+# Meshes, stars and fonts are built on first use (or read from the cache)
+assets = Assets(AssetCache(enabled=not args.no_asset_cache), timer,
+                star_seed=args.seed, num_stars=1500)  # 1500 stars
+
+
+# --- RESUME / FAST-FORWARD ---
+def load_checkpoint(path):
+    # Restore sim state; the sky is rebuilt only if it differs
+    global time_warp, sim_step, sim_time
+    ckpt = Checkpoint.load(path)
+    time_warp, sim_step, sim_time = ckpt.restore(player, camera)
+    assets.use_starfield(ckpt.star_seed, ckpt.num_stars)
+    print(f"Loaded checkpoint {path} (t={sim_time:.1f} s)")
+
+
+def save_checkpoint(path):
+    Checkpoint.capture(player, camera, assets.star_seed, assets.num_stars,
+                       time_warp, sim_step, sim_time).save(path)
+    print(f"Saved checkpoint {path} (t={sim_time:.1f} s)")
+
+
+if args.load:
+    try:
+        load_checkpoint(args.load)
+    except (OSError, ValueError) as e:
+        parser.error(f"cannot load {args.load}: {e}")
+if args.record:
+    # The telemetry header carries the sky, so Export.py can redraw it
+    recorder = TelemetryRecorder(args.record, star_seed=assets.star_seed)
+    print(f"Recording {args.record} (starfield seed {assets.star_seed})")
+if args.fast_forward is not None and not replay:
+    with timer.phase("fast-forward"):
+        sim_step, sim_time = fast_forward(player, planet, time_warp, sim_step, sim_time,
+                                          args.fast_forward, recorder=recorder)
+
+if args.headless:
+    # Batch runs stop here: no pygame, no window, no assets
+    save_checkpoint(args.checkpoint)
+    if recorder:
+        recorder.close()
+    if args.startup_report:
+        print(timer.report())
+    sys.exit(0)
 
 # --- SETUP ---
-pygame.init()
+# Chosen after the headless exit: batch runs don't need the import
+with timer.phase("math backend"):
+    try:
+        set_backend(args.math_backend)
+    except ImportError:
+        parser.error("--math-backend numpy needs NumPy installed")
+
+with timer.phase("pygame import"):
+    import pygame
+    from Hud import HUD
+    from Presenter import DirtyRectPresenter, ResolutionScaler
+    from Pipeline import Pipeline
+    from Renderer import render_scene
+    from Scene import build_scene
+
+with timer.phase("pygame init"):
+    pygame.init()
 WIDTH, HEIGHT = 1000, 800
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
+# DYNAMIC RESOLUTION (--dynamic-resolution)
+# Scene renders offscreen at a scale that holds --target-fps,
+# then is stretched to the window. HUD stays at native resolution.
+DYNAMIC_RESOLUTION = args.dynamic_resolution
+with timer.phase("display"):
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
 clock = pygame.time.Clock()
-HUD_font = pygame.font.Font("Y224-2vdae.ttf", 25)
-small_font = pygame.font.Font("Y224-2vdae.ttf", 11)
 # LOCK MOUSE (Hide cursor and get input)
 pygame.mouse.set_visible(False)
 pygame.event.set_grab(True)
 
 # --- INIT ENGINE OBJECTS ---
-player = Spacecraft(0, 0, 0)
-mesh_ship = ObjectLoader.load_obj("ship.obj")
-camera = Camera()
-starfield = Starfield(num_stars=1500)  # 1500 stars
 pipeline = Pipeline(WIDTH, HEIGHT)
-mesh_arrow = Mesh.make_pyramid(base_size=0.5, height=2.0)
-time_warp = 1.0
+scene = build_scene(planet, assets.mesh_planet, assets.mesh_ship)
+hud_font, small_font = assets.hud_font, assets.small_font
+with timer.phase("hud"):
+    hud = HUD(WIDTH, HEIGHT, hud_font, small_font)
+presenter = DirtyRectPresenter(screen)
+scaler = ResolutionScaler(WIDTH, HEIGHT, target_fps=args.target_fps,
+                          min_scale=args.min_scale, max_scale=args.max_scale,
+                          smoothing=args.smoothing)
+scene_surface = None  # Offscreen target while scaled below 1.0
 show_vectors = True
-# Planet Info:
-# 1 Unit = 1 kilometer
-# Position (0, 7000, 0)
-# Radius 6371 km
-# μ = 398600 km^3 /s^2
-planet = Planet(0, 7000, 0, 6371, 398600)
-
-# Generate Sphere
-# Resolution (25x25)
-mesh_planet = Mesh.make_sphere(radius=1.0, rings=25, sectors=25)
-
-
-# --- RENDER FUNCTIONS ---
-def render_mesh(screen, pipeline, mesh, camera, world_matrix, face_color=(255, 255, 255), wire_color=(0, 0, 0), draw_wires=True):
-
-    processed_tris = pipeline.process_mesh(
-        mesh, camera, world_matrix, base_color=face_color)
-    # 2. Draw the triangles
-    for tri_data in processed_tris:
-        tri_points = tri_data[0]
-        tri_color = tri_data[2]
-        flags = tri_data[3]
-
-        p1 = (tri_points[0].x, tri_points[0].y)
-        p2 = (tri_points[1].x, tri_points[1].y)
-        p3 = (tri_points[2].x, tri_points[2].y)
-
-        # Draw faces (color calculated by pipeline)
-        pygame.draw.polygon(screen, tri_color, [p1, p2, p3])
-
-        # Wireframe
-        if draw_wires:
-            if flags[0]:
-                pygame.draw.line(screen, wire_color, p1, p2, 1)
-            if flags[1]:
-                pygame.draw.line(screen, wire_color, p2, p3, 1)
-            if flags[2]:
-                pygame.draw.line(screen, wire_color, p3, p1, 1)
-    return
-
-
-def render_stars(screen, pipeline, stars, camera):
-    # Create Rotation Matrices
-    mat_rot_y = Matrix4.make_rotation_y(-camera.yaw)
-    mat_rot_x = Matrix4.make_rotation_x(camera.pitch)
-
-    # Combined Rotation Matrix
-    mat_view_rot = mat_rot_x @ mat_rot_y
-
-    # Iterate through every star
-    white = (255, 255, 255)
-    width = pipeline.width
-    height = pipeline.height
-
-    for star_vec in stars:
-        # Apply View Rotation
-        p_view = mat_view_rot.multiply_vector(star_vec)
-
-        # Check if it's behind us
-        # Rely on the Projection Matrix for this
-        if p_view.z < 0.1:
-            continue  # Star is behind player, no need to draw
-
-        # Apply Projection
-        p_proj = pipeline.mat_proj.multiply_vector(p_view)
-
-        # Perspective Divide
-        if p_proj.w != 0:
-            x = p_proj.x / p_proj.w
-            y = p_proj.y / p_proj.w
-        else:
-            continue
-
-        # Screen Coordinates $ Draw
-        screen_x = (x + 1.0) * 0.5 * width
-        screen_y = (1.0 - y) * 0.5 * height
-
-        if 0 <= screen_x < width and 0 <= screen_y < height:
-            screen.set_at((int(screen_x), int(screen_y)), white)
-
-
-def draw_vector_3d(screen, pipeline, camera, start_pos, vector, color):
-
-    # Draw the Shaft (Line)
-    end_pos = start_pos + vector
-
-    start_screen = pipeline.project_point(start_pos, camera)
-    end_screen = pipeline.project_point(end_pos, camera)
-
-    if start_screen and end_screen:
-        # Dynamic Thickness: Thicker when closer (Simple depth cue)
-        # start_screen[2] is the Z-depth returned by project_point
-        depth = start_screen[2]
-        thickness = max(1, int(100 / depth)) if depth > 0 else 1
-
-        pygame.draw.line(screen, color,
-                         (start_screen[0], start_screen[1]),
-                         (end_screen[0], end_screen[1]), thickness)
-
-    # Rotation
-    mat_rot = Matrix4.make_alignment(vector)
-
-    # Translation: Move to tip of line
-    mat_trans = Matrix4.make_translation(end_pos.x, end_pos.y, end_pos.z)
-
-    scale = 1.0  # Adjustable size factor
-    mat_scale = Matrix4.make_scaling(scale, scale, scale)
-
-    # Position * Rotation * Scale
-    mat_arrow = mat_trans @ (mat_rot @ mat_scale)
-
-    # Render the arrowhead mesh
-    render_mesh(screen, pipeline, mesh_arrow, camera, mat_arrow,
-                face_color=color, wire_color=color, draw_wires=False)
+first_frame = True
 
 
 # --- MAIN LOOP ---
 running = True
 while running:
+    if mem_profiler:
+        mem_profiler.begin_frame()
     # 1. EVENTS
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
@@ -166,6 +210,42 @@ while running:
             # TOGGLE VECTORS
             if event.key == pygame.K_v:
                 show_vectors = not show_vectors
+            # QUICK SAVE / LOAD
+            if event.key == pygame.K_F5 and not replay:
+                save_checkpoint(args.checkpoint)
+            if event.key == pygame.K_F9 and recorder:
+                # Rewinding would make the recorded times jump backwards
+                print("Quickload is disabled while recording")
+            elif event.key == pygame.K_F9 and not replay:
+                try:
+                    load_checkpoint(args.checkpoint)
+                except FileNotFoundError:
+                    print(f"No checkpoint at {args.checkpoint}")
+                except (OSError, ValueError) as e:
+                    # A bad quicksave must not end the run
+                    print(f"Could not load {args.checkpoint}: {e}")
+            # REPLAY CONTROLS
+            if replay:
+                if event.key == pygame.K_SPACE:
+                    replay.paused = not replay.paused
+                if event.key == pygame.K_LEFT:
+                    replay.speed = -abs(replay.speed)  # Play backwards
+                if event.key == pygame.K_RIGHT:
+                    replay.speed = abs(replay.speed)   # Play forwards
+                if event.key == pygame.K_UP:
+                    replay.speed = replay.speed * 2.0
+                if event.key == pygame.K_DOWN:
+                    replay.speed = replay.speed * 0.5
+                if event.key == pygame.K_LEFTBRACKET:
+                    replay.seek(replay.time - 10.0)
+                if event.key == pygame.K_RIGHTBRACKET:
+                    replay.seek(replay.time + 10.0)
+                if event.key == pygame.K_HOME:
+                    replay.seek(replay.start_time)
+                if event.key == pygame.K_END:
+                    replay.seek(replay.end_time)
+        if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+            presenter.invalidate()  # Window contents lost, redraw all
         if event.type == pygame.MOUSEWHEEL:
             if camera.mode == 'follow' or 'chase':
                 # event.y is +1 for scroll up, -1 for scroll down
@@ -174,24 +254,31 @@ while running:
     # 2. PHYSICS UPDATE
     keys = pygame.key.get_pressed()
     mouse_delta = pygame.mouse.get_rel()
-    player.apply_gravity(planet, dt=time_warp)
-    player.update(keys, mouse_delta, dt=time_warp,
-                  controls_enabled=(camera.mode == 'chase'))
-    player.check_collision(planet)
+    if replay:
+        # Recorded state replaces physics
+        replay.advance(clock.get_time() / 1000.0)
+        state = replay.apply(player)
+        time_warp = state['time_warp']
+        sim_time = replay.time
+    else:
+        player.step(planet, keys, mouse_delta, dt=time_warp,
+                    controls_enabled=(camera.mode == 'chase'))
+        sim_step += 1
+        sim_time += time_warp / 60.0
+
+        if recorder:
+            controls_enabled = (camera.mode == 'chase')
+            recorder.record(sim_step, sim_time, player, time_warp,
+                            encode_controls(controls_enabled and keys[pygame.K_w],
+                                            controls_enabled and keys[pygame.K_s],
+                                            controls_enabled))
 
     # HUD info calculations
     altitude = player.pos.distance_to(planet.pos) - planet.radius
     speed = player.vel.magnitude() * 60
-    hud_fps = HUD_font.render(
-        f"FPS: {int(clock.get_fps())}", True, (255, 255, 0))
-    hud_altitude = HUD_font.render(
-        f"Altitude: {altitude:7.1f}  km", True, (255, 255, 0))
-    hud_speed = HUD_font.render(
-        f"Speed: {speed:10.1f}  km/s", True, (255, 255, 0))
-    hud_camera_mode = small_font.render(
-        f"Camera Mode: {camera.mode.upper()}", True, (255, 0, 0))
-    hud_time_warp = small_font.render(
-        f"Time Warp: {time_warp:.1f}x", True, (255, 0, 255))
+    hud.update(altitude, speed, time_warp, camera.mode, int(clock.get_fps()),
+               replay=(replay.time, replay.speed, replay.paused) if replay else None,
+               culled=(scene.cull_stats['culled'], scene.cull_stats['tested']))
     # 3. CAMERA UPDATE
     if camera.mode == 'chase':
         camera.chase(player)
@@ -200,109 +287,60 @@ while running:
     elif camera.mode == 'follow':
         camera.follow(player, mouse_delta)
     # 4. RENDER
-    screen.fill((0, 0, 0))
-    # --- DRAW BACKGROUND STARS ---
-    render_stars(screen, pipeline, starfield.stars, camera)
-    # --- DRAW PLANET ---
-    scale = planet.radius
-    mat_scale = Matrix4.make_scaling(scale, scale, scale)
-    mat_scale.m = [
-        [scale, 0, 0, 0],
-        [0, scale, 0, 0],
-        [0, 0, scale, 0],
-        [0, 0, 0, 1]
-    ]
-
-    mat_trans = Matrix4.make_translation(
-        planet.pos.x, planet.pos.y, planet.pos.z)
-
-    # Model Matrix = Translate * Scale
-    mat_planet = mat_trans @ mat_scale
-
-    # --- DRAW PLAYER ---
-    mat_fix = Matrix4.make_rotation_x(90)  # Rocket model faces +X by default
-    mat_rot_y = Matrix4.make_rotation_y(player.yaw)
-    mat_rot_x = Matrix4.make_rotation_x(player.pitch)
-    mat_trans = Matrix4.make_translation(
-        player.pos.x, player.pos.y, player.pos.z)
-
-    player_matrix = mat_trans @ (mat_rot_y @ mat_rot_x) @ mat_fix
-    # RENDER ORDER BASED ON CAMERA DISTANCE
-    if camera.pos.distance_to(planet.pos) < camera.pos.distance_to(player.pos):
-        render_mesh(screen, pipeline, mesh_ship, camera, player_matrix,
-                    face_color=(150, 150, 150), wire_color=(255, 255, 255))
-
-        render_mesh(screen, pipeline, mesh_planet, camera, mat_planet,
-                    face_color=(0, 0, 200), wire_color=(0, 150, 0), draw_wires=False)
-    elif camera.pos.distance_to(planet.pos) >= camera.pos.distance_to(player.pos):
-        render_mesh(screen, pipeline, mesh_planet, camera, mat_planet,
-                    face_color=(0, 0, 200), wire_color=(0, 150, 0), draw_wires=False)
-
-        render_mesh(screen, pipeline, mesh_ship, camera, player_matrix,
-                    face_color=(150, 150, 150), wire_color=(255, 255, 255))
-
-    # --- VECTOR VISUALIZATION ---
-    if show_vectors:
-        # Velocity (Green)
-        draw_vector_3d(screen, pipeline, camera, player.pos,
-                       player.vel * 2.0, (0, 255, 0))
-
-        # Gravity (Red)
-        grav_dir = (planet.pos - player.pos).normalize() * 12.5
-        draw_vector_3d(screen, pipeline, camera,
-                       player.pos, grav_dir, (255, 0, 0))
-
-        # Heading / Thrust (Yellow)
-        # Recalculated with same math as Spacecraft.py
-        import math
-        rad_yaw = math.radians(player.yaw)
-        rad_pitch = math.radians(player.pitch)
-        fx = math.sin(rad_yaw) * math.cos(rad_pitch)
-        fy = -math.sin(rad_pitch)
-        fz = math.cos(rad_yaw) * math.cos(rad_pitch)
-        forward_vec = Vector3(fx, fy, fz) * 5.0
-
-        draw_vector_3d(screen, pipeline, camera, player.pos,
-                       forward_vec, (255, 255, 0))
-        # --- DRAW LEGEND ---
-        # Draw on the right side of the screen
-        legend_x = 900
-        legend_y = 200  # A bit lower down
-
-        vec_font = small_font
-
-        # Guide Text
-        text_guide = vec_font.render("VECTORS:", True, (255, 255, 255))
-        screen.blit(text_guide, (legend_x, legend_y - 20))
-        # Green Text
-        text_vel = vec_font.render("VELOCITY", True, (0, 255, 0))
-        screen.blit(text_vel, (legend_x, legend_y))
-
-        # Red Text
-        text_grav = vec_font.render("GRAVITY", True, (255, 0, 0))
-        screen.blit(text_grav, (legend_x, legend_y + 15))
-
-        # Yellow Text
-        text_head = vec_font.render("HEADING", True, (255, 255, 0))
-        screen.blit(text_head, (legend_x, legend_y + 30))
-
-    # DRAW HUD
-    screen.blit(hud_altitude, (10, 10))
-    screen.blit(hud_speed, (10, 35))
-    screen.blit(hud_time_warp, (10, 135))
-    screen.blit(hud_camera_mode, (10, 160))
-    screen.blit(small_font.render("W / D = Forward / Back",
-                True, (255, 0, 0)), (10, HEIGHT - 90))
-    screen.blit(small_font.render("Mouse = Look",
-                True, (255, 0, 0)), (10, HEIGHT - 72))
-    screen.blit(small_font.render("C = Switch Camera",
-                True, (255, 0, 0)), (10, HEIGHT - 54))
-    screen.blit(small_font.render("R / T / Y = Time Warp",
-                True, (255, 0, 0)), (10, HEIGHT - 36))
-    screen.blit(small_font.render("V = Toggle Vectors",
-                True, (255, 0, 0)), (10, HEIGHT - 18))
-    screen.blit(hud_fps, (WIDTH - 200, 10))
-    pygame.display.flip()
+    if DYNAMIC_RESOLUTION and scaler.scale < 1.0:
+        render_size = scaler.render_size()
+        if scene_surface is None or scene_surface.get_size() != render_size:
+            scene_surface = pygame.Surface(render_size)
+            pipeline.set_viewport(*render_size)
+        target = scene_surface
+        target.fill((0, 0, 0))
+    else:
+        if scene_surface is not None:
+            # Back to native: drop the offscreen surface
+            scene_surface = None
+            pipeline.set_viewport(WIDTH, HEIGHT)
+            presenter.invalidate()
+        target = screen
+        # Only erase what was drawn last frame
+        presenter.clear()
+    # --- DRAW SCENE ---
+    presenter.add_all(render_scene(target, pipeline, camera, scene, player, planet,
+                                   assets.starfield, assets.mesh_arrow, show_vectors))
+
+    if target is not screen:
+        # Upscale the scene; the whole window changes this frame
+        pygame.transform.scale(target, (WIDTH, HEIGHT), screen)
+        presenter.invalidate()
+
+    # DRAW HUD (Static legend/controls are pre-rendered)
+    presenter.add_all(hud.draw(screen, show_legend=show_vectors))
+    # Partial update, or full flip when most of the screen changed
+    presenter.present()
+    if first_frame:
+        # Startup ends when the first frame is on screen
+        first_frame = False
+        # Assets are loaded by now (first render), so freeze after it
+        if args.gc_freeze:
+            # Not a sim pause: keep the forced collection out of the GC stats
+            with timer.phase("gc freeze"), (mem_profiler.paused() if mem_profiler
+                                            else nullcontext()):
+                frozen = freeze_long_lived()
+            print(f"GC: froze {frozen} startup objects")
+        if args.startup_report:
+            print(timer.report())
+    if mem_profiler:
+        # Before tick(): the idle wait isn't frame work
+        mem_profiler.end_frame()
     clock.tick(60)
-
+    if DYNAMIC_RESOLUTION:
+        # Raw time excludes the delay spent waiting in tick()
+        scaler.update(clock.get_rawtime())
+
+if recorder:
+    recorder.close()
+if replay:
+    replay.close()
+if mem_profiler:
+    mem_profiler.stop()
+    print(mem_profiler.report())
 pygame.quit()
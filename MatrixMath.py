@@ -1,4 +1,6 @@
+import array
 import math
+import operator
 
 
 class Vector3:
@@ -87,6 +89,36 @@ class Matrix4:
         result.w = w  # Store w manually
         return result
 
+    def inverse_affine(self):
+        # Inverse of a model matrix (rotation/scale + translation,
+        # bottom row 0 0 0 1). The 3x3 part is inverted by cofactors,
+        # the translation is then -inverse(3x3) @ t.
+        m = self.m
+        a, b, c = m[0][0], m[0][1], m[0][2]
+        d, e, f = m[1][0], m[1][1], m[1][2]
+        g, h, i = m[2][0], m[2][1], m[2][2]
+
+        co_a = e * i - f * h
+        co_b = f * g - d * i
+        co_c = d * h - e * g
+        det = a * co_a + b * co_b + c * co_c
+        if det == 0:
+            raise ValueError("Matrix is not invertible")
+        inv_det = 1.0 / det
+
+        r = [
+            [co_a * inv_det, (c * h - b * i) * inv_det, (b * f - c * e) * inv_det],
+            [co_b * inv_det, (a * i - c * g) * inv_det, (c * d - a * f) * inv_det],
+            [co_c * inv_det, (b * g - a * h) * inv_det, (a * e - b * d) * inv_det],
+        ]
+        tx, ty, tz = m[0][3], m[1][3], m[2][3]
+
+        result = Matrix4()
+        for row in range(3):
+            result.m[row][0:3] = r[row]
+            result.m[row][3] = -(r[row][0] * tx + r[row][1] * ty + r[row][2] * tz)
+        return result
+
     # --- STATIC GENERATORS ---
 
     @staticmethod
@@ -193,3 +225,326 @@ class Matrix4:
             [0,       0,       0,       1]
         ]
         return mat
+
+
+class Quaternion:
+    def __init__(self, w=1.0, x=0.0, y=0.0, z=0.0):
+        # Identity rotation by default
+        self.w = float(w)
+        self.x = float(x)
+        self.y = float(y)
+        self.z = float(z)
+
+    def __mul__(self, other):
+        # Hamilton product: (self * other) applies 'other' first
+        return Quaternion(
+            self.w * other.w - self.x * other.x - self.y * other.y - self.z * other.z,
+            self.w * other.x + self.x * other.w + self.y * other.z - self.z * other.y,
+            self.w * other.y - self.x * other.z + self.y * other.w + self.z * other.x,
+            self.w * other.z + self.x * other.y - self.y * other.x + self.z * other.w)
+
+    def __repr__(self):
+        return f"Quat({self.w}, {self.x}, {self.y}, {self.z})"
+
+    def normalize(self):
+        m = math.sqrt(self.w**2 + self.x**2 + self.y**2 + self.z**2)
+        if m == 0:
+            return Quaternion()
+        return Quaternion(self.w / m, self.x / m, self.y / m, self.z / m)
+
+    def rotate(self, vec):
+        # Rotate a vector (q * v * q^-1, expanded)
+        # t = 2 * cross(q.xyz, v); v' = v + w * t + cross(q.xyz, t)
+        tx = 2.0 * (self.y * vec.z - self.z * vec.y)
+        ty = 2.0 * (self.z * vec.x - self.x * vec.z)
+        tz = 2.0 * (self.x * vec.y - self.y * vec.x)
+        return Vector3(
+            vec.x + self.w * tx + (self.y * tz - self.z * ty),
+            vec.y + self.w * ty + (self.z * tx - self.x * tz),
+            vec.z + self.w * tz + (self.x * ty - self.y * tx))
+
+    def to_matrix(self):
+        # Rotation matrix (unit quaternion assumed)
+        w, x, y, z = self.w, self.x, self.y, self.z
+        mat = Matrix4()
+        mat.m = [
+            [1 - 2 * (y*y + z*z), 2 * (x*y - w*z),     2 * (x*z + w*y),     0.0],
+            [2 * (x*y + w*z),     1 - 2 * (x*x + z*z), 2 * (y*z - w*x),     0.0],
+            [2 * (x*z - w*y),     2 * (y*z + w*x),     1 - 2 * (x*x + y*y), 0.0],
+            [0.0,                 0.0,                 0.0,                 1.0]
+        ]
+        return mat
+
+    # --- STATIC GENERATORS ---
+
+    @staticmethod
+    def from_axis_angle(axis, angle_deg):
+        half = math.radians(angle_deg) * 0.5
+        s = math.sin(half)
+        a = axis.normalize()
+        return Quaternion(math.cos(half), a.x * s, a.y * s, a.z * s)
+
+    @staticmethod
+    def from_euler(yaw, pitch, roll=0.0):
+        # Same order as Matrix4: RotY(yaw) @ RotX(pitch) @ RotZ(roll)
+        q_yaw = Quaternion.from_axis_angle(Vector3(0, 1, 0), yaw)
+        q_pitch = Quaternion.from_axis_angle(Vector3(1, 0, 0), pitch)
+        q_roll = Quaternion.from_axis_angle(Vector3(0, 0, 1), roll)
+        return q_yaw * q_pitch * q_roll
+
+
+# --- BATCH VECTORS ---
+# Vector3Array stores many vectors as three columns (x, y, z). Column
+# math goes through a backend: array('d') and plain loops, or NumPy
+# arrays. Pick one with set_backend() at startup. The default is the
+# pure Python one: the only batch user so far (the starfield) runs
+# about as fast there, and importing NumPy costs ~100 ms of startup.
+
+class PythonBackend:
+    name = 'python'
+
+    @staticmethod
+    def column(values):
+        return array.array('d', values)
+
+    @staticmethod
+    def full(count, value):
+        return array.array('d', [value]) * count
+
+    @staticmethod
+    def add(a, b):
+        return array.array('d', map(operator.add, a, b))
+
+    @staticmethod
+    def sub(a, b):
+        return array.array('d', map(operator.sub, a, b))
+
+    @staticmethod
+    def mul(a, b):
+        return array.array('d', map(operator.mul, a, b))
+
+    @staticmethod
+    def div(a, b):
+        # x / 0 -> 0, like Vector3.__truediv__
+        return array.array('d', [x / y if y else 0.0 for x, y in zip(a, b)])
+
+    @staticmethod
+    def add_scalar(a, s):
+        return array.array('d', [x + s for x in a])
+
+    @staticmethod
+    def mul_scalar(a, s):
+        return array.array('d', [x * s for x in a])
+
+    @staticmethod
+    def sqrt(a):
+        return array.array('d', map(math.sqrt, a))
+
+    @staticmethod
+    def transform(x, y, z, m, w):
+        # One fused pass per output row instead of a temporary per term
+        points = list(zip(x, y, z))
+        return [array.array('d', [r0 * px + r1 * py + r2 * pz + t for px, py, pz in points])
+                for r0, r1, r2, t in ((r[0], r[1], r[2], r[3] * w) for r in m)]
+
+    @staticmethod
+    def to_list(a):
+        return a.tolist()
+
+
+class NumpyBackend:
+    name = 'numpy'
+
+    def __init__(self):
+        import numpy
+        self.np = numpy
+
+    def column(self, values):
+        return self.np.array(values, dtype=float)
+
+    def full(self, count, value):
+        return self.np.full(count, value, dtype=float)
+
+    @staticmethod
+    def add(a, b):
+        return a + b
+
+    @staticmethod
+    def sub(a, b):
+        return a - b
+
+    @staticmethod
+    def mul(a, b):
+        return a * b
+
+    def div(self, a, b):
+        # x / 0 -> 0, like Vector3.__truediv__
+        out = self.np.zeros_like(a)
+        return self.np.divide(a, b, out=out, where=(b != 0))
+
+    @staticmethod
+    def add_scalar(a, s):
+        return a + s
+
+    @staticmethod
+    def mul_scalar(a, s):
+        return a * s
+
+    def sqrt(self, a):
+        return self.np.sqrt(a)
+
+    @staticmethod
+    def transform(x, y, z, m, w):
+        return [x * r[0] + y * r[1] + z * r[2] + r[3] * w for r in m]
+
+    @staticmethod
+    def to_list(a):
+        return a.tolist()
+
+
+_backend = None
+
+
+def set_backend(name='auto'):
+    # 'numpy', 'python' or 'auto' (NumPy if it can be imported)
+    global _backend
+    if name == 'python':
+        _backend = PythonBackend()
+    elif name == 'numpy':
+        _backend = NumpyBackend()  # ImportError if NumPy is missing
+    elif name == 'auto':
+        try:
+            _backend = NumpyBackend()
+        except ImportError:
+            _backend = PythonBackend()
+    else:
+        raise ValueError(f"Unknown math backend: {name}")
+    return _backend
+
+
+def get_backend():
+    if _backend is None:
+        set_backend('python')
+    return _backend
+
+
+class Vector3Array:
+    def __init__(self, x, y, z, backend=None):
+        # x, y, z: columns already in the backend's format
+        self.backend = backend or get_backend()
+        self.x = x
+        self.y = y
+        self.z = z
+        self.w = None  # Set by transform(), like Vector3.w
+
+    # --- CONSTRUCTION ---
+
+    @staticmethod
+    def from_columns(xs, ys, zs):
+        b = get_backend()
+        return Vector3Array(b.column(xs), b.column(ys), b.column(zs), b)
+
+    @staticmethod
+    def from_vectors(vectors):
+        vectors = list(vectors)
+        return Vector3Array.from_columns([v.x for v in vectors],
+                                         [v.y for v in vectors],
+                                         [v.z for v in vectors])
+
+    def _new(self, x, y, z):
+        return Vector3Array(x, y, z, self.backend)
+
+    def __len__(self):
+        return len(self.x)
+
+    def __getitem__(self, i):
+        return Vector3(self.x[i], self.y[i], self.z[i])
+
+    def __iter__(self):
+        for x, y, z in zip(*self.columns()):
+            yield Vector3(x, y, z)
+
+    def __repr__(self):
+        return f"Vec3Array({len(self)}, backend={self.backend.name})"
+
+    def columns(self):
+        # Plain Python lists, for loops that hand values to pygame etc.
+        to_list = self.backend.to_list
+        return to_list(self.x), to_list(self.y), to_list(self.z)
+
+    # --- ARITHMETIC OPERATIONS ---
+    # 'other' is another Vector3Array (element-wise) or a Vector3
+    # (the same vector applied to every element)
+
+    def __add__(self, other):
+        b = self.backend
+        if isinstance(other, Vector3):
+            return self._new(b.add_scalar(self.x, other.x),
+                             b.add_scalar(self.y, other.y),
+                             b.add_scalar(self.z, other.z))
+        return self._new(b.add(self.x, other.x), b.add(self.y, other.y), b.add(self.z, other.z))
+
+    def __sub__(self, other):
+        b = self.backend
+        if isinstance(other, Vector3):
+            return self._new(b.add_scalar(self.x, -other.x),
+                             b.add_scalar(self.y, -other.y),
+                             b.add_scalar(self.z, -other.z))
+        return self._new(b.sub(self.x, other.x), b.sub(self.y, other.y), b.sub(self.z, other.z))
+
+    def __mul__(self, scalar):
+        b = self.backend
+        return self._new(b.mul_scalar(self.x, scalar),
+                         b.mul_scalar(self.y, scalar),
+                         b.mul_scalar(self.z, scalar))
+
+    # --- VECTOR OPERATIONS ---
+
+    def dot(self, other):
+        # One value per element (a backend column)
+        b = self.backend
+        if isinstance(other, Vector3):
+            return b.add(b.add(b.mul_scalar(self.x, other.x),
+                               b.mul_scalar(self.y, other.y)),
+                         b.mul_scalar(self.z, other.z))
+        return b.add(b.add(b.mul(self.x, other.x), b.mul(self.y, other.y)),
+                     b.mul(self.z, other.z))
+
+    def cross(self, other):
+        b = self.backend
+        if isinstance(other, Vector3):
+            ox, oy, oz = (b.full(len(self), v) for v in (other.x, other.y, other.z))
+        else:
+            ox, oy, oz = other.x, other.y, other.z
+        return self._new(b.sub(b.mul(self.y, oz), b.mul(self.z, oy)),
+                         b.sub(b.mul(self.z, ox), b.mul(self.x, oz)),
+                         b.sub(b.mul(self.x, oy), b.mul(self.y, ox)))
+
+    def magnitude(self):
+        return self.backend.sqrt(self.dot(self))
+
+    def normalize(self):
+        # Zero-length elements stay zero, like Vector3.normalize
+        b = self.backend
+        m = self.magnitude()
+        return self._new(b.div(self.x, m), b.div(self.y, m), b.div(self.z, m))
+
+    def transform(self, matrix, w=1.0):
+        # Matrix4 applied to every element (w=1 points, w=0 directions)
+        # The result's w column holds the 4th row, as in multiply_vector
+        out = self.backend.transform(self.x, self.y, self.z, matrix.m, w)
+        result = self._new(out[0], out[1], out[2])
+        result.w = out[3]
+        return result
+
+    # --- SERIALIZATION (Asset cache) ---
+    # Stored as plain floats so a cache written with one backend loads
+    # with the other
+
+    def __getstate__(self):
+        return {'columns': self.columns()}
+
+    def __setstate__(self, state):
+        b = get_backend()
+        xs, ys, zs = state['columns']
+        self.__init__(b.column(xs), b.column(ys), b.column(zs), b)
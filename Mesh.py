@@ -1,4 +1,5 @@
 from MatrixMath import Vector3
+from Bvh import BVH
 
 
 class Triangle:
@@ -12,10 +13,99 @@ class Triangle:
         else:
             self.edge_flags = flags
 
+        # Index into Mesh.edges per edge, -1 for hidden edges
+        self.edge_ids = [-1, -1, -1]
+
 
 class Mesh:
     def __init__(self):
         self.triangles = []  # List of Triangle objects
+        self.edges = None    # Unique wireframe edges (see build_edges)
+        self.bvh = None      # Ray query acceleration (see build_bvh)
+        self.radius = None   # Bounding sphere about the origin (see bounding_radius)
+
+    def build_edges(self):
+        # Deduplicate wireframe edges shared by adjacent triangles
+        # Vertices are matched by position, so seams and loaders that
+        # duplicate vertices still share their edges.
+        # Hidden edges (fan diagonals, edge_flags False) get id -1.
+        edge_index = {}
+        self.edges = []
+
+        for tri in self.triangles:
+            keys = [(p.x, p.y, p.z) for p in tri.p]
+            for i in range(3):
+                if not tri.edge_flags[i]:
+                    tri.edge_ids[i] = -1
+                    continue
+
+                a = keys[i]
+                b = keys[(i + 1) % 3]
+                key = (a, b) if a < b else (b, a)
+
+                edge_id = edge_index.get(key)
+                if edge_id is None:
+                    edge_id = len(self.edges)
+                    edge_index[key] = edge_id
+                    self.edges.append((tri.p[i], tri.p[(i + 1) % 3]))
+                tri.edge_ids[i] = edge_id
+
+        return self.edges
+
+    def bounding_radius(self):
+        # Distance from the model origin to the farthest vertex
+        if self.radius is None:
+            self.radius = max((p.magnitude() for tri in self.triangles for p in tri.p),
+                              default=0.0)
+        return self.radius
+
+    def build_bvh(self):
+        # Built once at load time; meshes are not edited afterwards
+        self.bvh = BVH.build(self)
+        return self.bvh
+
+    # --- SERIALIZATION (Asset cache) ---
+    # Pickled as flat vertex / index lists instead of one object graph
+    # per triangle, which is several times smaller and faster to load.
+    # Shared vertices stay shared after loading.
+
+    def __getstate__(self):
+        vert_index = {}
+        verts = []
+        tris = []
+        for tri in self.triangles:
+            ids = []
+            for p in tri.p:
+                k = vert_index.get(id(p))
+                if k is None:
+                    k = len(verts)
+                    vert_index[id(p)] = k
+                    verts.append((p.x, p.y, p.z))
+                ids.append(k)
+            n = tri.normal
+            tris.append((ids, (n.x, n.y, n.z), tri.color,
+                         tri.edge_flags, tri.edge_ids))
+
+        edges = None
+        if self.edges is not None:
+            edges = [(vert_index[id(a)], vert_index[id(b)]) for a, b in self.edges]
+        return {'verts': verts, 'tris': tris, 'edges': edges, 'bvh': self.bvh}
+
+    def __setstate__(self, state):
+        verts = [Vector3(x, y, z) for x, y, z in state['verts']]
+        self.triangles = []
+        for ids, normal, color, flags, edge_ids in state['tris']:
+            tri = Triangle(verts[ids[0]], verts[ids[1]], verts[ids[2]], flags=flags)
+            tri.normal = Vector3(*normal)
+            tri.color = color
+            tri.edge_ids = edge_ids
+            self.triangles.append(tri)
+
+        self.edges = None
+        if state['edges'] is not None:
+            self.edges = [(verts[a], verts[b]) for a, b in state['edges']]
+        self.bvh = state['bvh']
+        self.radius = None
 
     @staticmethod
     def make_cube():
@@ -48,6 +138,8 @@ class Mesh:
             p3 = verts[indices[i+2]]
             mesh.triangles.append(Triangle(p1, p2, p3))
 
+        mesh.build_edges()
+        mesh.build_bvh()
         return mesh
 
     @staticmethod
@@ -98,6 +190,8 @@ class Mesh:
 
         mesh = Mesh()
         mesh.triangles = tris
+        mesh.build_edges()
+        mesh.build_bvh()
         return mesh
 
     @staticmethod
@@ -123,4 +217,6 @@ class Mesh:
         mesh.triangles.append(Triangle(b1, b2, b3))
         mesh.triangles.append(Triangle(b1, b3, b4))
 
+        mesh.build_edges()
+        mesh.build_bvh()
         return mesh
@@ -52,7 +52,10 @@ class ObjectLoader:
                             mesh.triangles.append(
                                 Triangle(p1, p2, p3, flags=[e0, e1, e2]))
 
-            print(f"Loaded {filename}: {len(mesh.triangles)} triangles.")
+            mesh.build_edges()
+            mesh.build_bvh()
+            print(f"Loaded {filename}: {len(mesh.triangles)} triangles, "
+                  f"{len(mesh.edges)} edges.")
             return mesh
 
         except FileNotFoundError:
@@ -1,9 +1,75 @@
 import math
+from collections import OrderedDict
 from MatrixMath import Matrix4, Vector3
 
+# Draw list cache keys round matrices to this many decimals, so float
+# noise in otherwise unchanged transforms still hits the cache
+CACHE_DECIMALS = 6
+
+# Near clip plane (view space z). The projection copies view z into w,
+# so this is also the homogeneous w = NEAR_PLANE plane.
+NEAR_PLANE = 0.1
+
+# Guard band, in viewports (NDC -2..2 for 2.0). Vertices inside it are
+# handed to pygame as is; triangles reaching past it are clipped first,
+# since filling polygons with far off-screen corners gets very slow.
+GUARD_BAND = 2.0
+
+# Triangles are only rejected when they lie this many pixels or more
+# outside the viewport, so 1px wires on the border are never lost
+REJECT_MARGIN = 2
+
+
+def clip_triangle(views, edge_flags, edge_ids, planes):
+    # Clip a triangle (view space) against planes (a, b, c, d), keeping
+    # the side where a*x + b*y + c*z + d >= 0 (Sutherland-Hodgman).
+    # Returns [(vertices, edge_flags, edge_ids), ...] as a triangle fan
+    # in the original winding. Kept pieces of the original edges keep
+    # their flags/ids; edges the clip creates (along a plane, or fan
+    # diagonals) are hidden.
+
+    # Polygon as (vertex, flag, id) where the edge runs to the next vertex
+    poly = list(zip(views, edge_flags, edge_ids))
+    for a, b, c, d in planes:
+        dist = [a * v.x + b * v.y + c * v.z + d for v, _, _ in poly]
+        if min(dist) >= 0:
+            continue
+        if max(dist) < 0:
+            return []
+
+        out = []
+        n = len(poly)
+        for i in range(n):
+            v, flag, edge_id = poly[i]
+            w = poly[(i + 1) % n][0]
+            d0 = dist[i]
+            d1 = dist[(i + 1) % n]
+            if d0 >= 0:
+                out.append((v, flag, edge_id))
+            if (d0 >= 0) != (d1 >= 0):
+                t = d0 / (d0 - d1)
+                hit = Vector3(v.x + (w.x - v.x) * t, v.y + (w.y - v.y) * t, v.z + (w.z - v.z) * t)
+                if d0 >= 0:
+                    # Leaving: the next edge runs along the plane
+                    out.append((hit, False, -1))
+                else:
+                    # Entering: the rest of the original edge
+                    out.append((hit, flag, edge_id))
+        poly = out
+
+    # Fan from the first vertex
+    pieces = []
+    last = len(poly) - 2
+    for i in range(1, last + 1):
+        (v0, f0, i0), (v1, f1, i1), (v2, f2, i2) = poly[0], poly[i], poly[i + 1]
+        pieces.append(((v0, v1, v2),
+                       [f0 if i == 1 else False, f1, f2 if i == last else False],
+                       [i0 if i == 1 else -1, i1, i2 if i == last else -1]))
+    return pieces
+
 
 class Pipeline:
-    def __init__(self, width, height, fov=90.0):
+    def __init__(self, width, height, fov=90.0, cache_size=64):
         self.width = width
         self.height = height
         self.aspect_ratio = height / width  # NOTE: Depending on matrix math, might be w/h
@@ -11,90 +77,219 @@ class Pipeline:
 
         # 1. SETUP PROJECTION MATRIX
         self.mat_proj = Matrix4.make_projection(
-            fov, self.aspect_ratio, 0.1, 1000.0)
+            fov, self.aspect_ratio, NEAR_PLANE, 1000.0)
+
+        # 2. RETAINED DRAW LISTS (LRU)
+        # Paused sims and cameras locked to a coasting ship produce the
+        # same draw list frame after frame; reuse it instead of redoing
+        # the per-triangle work. cache_size 0 disables the cache.
+        self.cache_size = cache_size
+        self.draw_cache = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+        # Triangle counters (for profiling), counted on cache misses
+        self.tris_clipped = 0    # Split at the near plane or guard band
+        self.tris_offscreen = 0  # Rejected by the guard band
+
+    def set_viewport(self, width, height):
+        # Change the output resolution (dynamic resolution)
+        # Aspect ratio is kept, so only the screen scale changes
+        self.width = width
+        self.height = height
+        self.aspect_ratio = height / width
+        self.mat_proj = Matrix4.make_projection(
+            self.fov, self.aspect_ratio, NEAR_PLANE, 1000.0)
 
     def process_mesh(self, mesh, camera, world_matrix, base_color=(255, 255, 255)):
-        triangles_to_draw = []
+        # Single instance of the batched path
+        return self.process_instances(mesh, camera, [world_matrix], [base_color])
 
-        # --- STEP 1: DEFINE WORLD MATRICES ---
-        # Don't calculate rotations here.
-        # Main.py did the physics math and sent us the final matrix.
-        mat_world = world_matrix
+    def draw_list_key(self, mesh, model_views, world_matrices, colors):
+        # Everything the draw list depends on: the mesh, the viewport,
+        # and per instance the model-view matrix (geometry, culling,
+        # depth), the world rotation/scale (lighting) and the color.
+        # World translation only matters through the model-view matrix.
+        key = [id(mesh), self.width, self.height]
+        for mat_model_view, mat_world, color in zip(model_views, world_matrices, colors):
+            mv = mat_model_view.m
+            w = mat_world.m
+            key.append((tuple(round(v, CACHE_DECIMALS) for row in mv[:3] for v in row),
+                        tuple(round(v, CACHE_DECIMALS) for row in w[:3] for v in row[:3]),
+                        color))
+        return tuple(key)
+
+    def clear_cache(self):
+        self.draw_cache.clear()
+
+    def process_instances(self, mesh, camera, world_matrices, colors):
+        # Process many copies of one mesh in a single pass
+        # Each instance gets its own world matrix and base color.
+        # Returns one merged draw list, depth sorted across all instances.
+        # The list may be shared with later frames: treat it as read only.
+
+        # Meshes assembled by hand get their edge list on first use
+        if mesh.edges is None:
+            mesh.build_edges()
 
         mat_view = camera.get_view_matrix()
 
-        # LOOP THROUGH ALL TRIANGLES IN THE MESH
-        for tri in mesh.triangles:
-            tri_projected = [Vector3(), Vector3(), Vector3()]
-
-            p0_trans = mat_world.multiply_vector(tri.p[0])
-            p1_trans = mat_world.multiply_vector(tri.p[1])
-            p2_trans = mat_world.multiply_vector(tri.p[2])
-
-            p0_view = mat_view.multiply_vector(p0_trans)
-            p1_view = mat_view.multiply_vector(p1_trans)
-            p2_view = mat_view.multiply_vector(p2_trans)
-
-            line1 = p1_view - p0_view
-            line2 = p2_view - p0_view
-            normal_view = line1.cross(line2).normalize()
-            camera_ray = p0_view.normalize()
-            if normal_view.dot(camera_ray) > 0:
-                continue
-            if p0_view.z < 0.1 or p1_view.z < 0.1 or p2_view.z < 0.1:
-                continue
-
-            p0_proj = self.mat_proj.multiply_vector(p0_view)
-            p1_proj = self.mat_proj.multiply_vector(p1_view)
-            p2_proj = self.mat_proj.multiply_vector(p2_view)
-
-            if p0_proj.w != 0:
-                p0_proj = p0_proj / p0_proj.w
-            if p1_proj.w != 0:
-                p1_proj = p1_proj / p1_proj.w
-            if p2_proj.w != 0:
-                p2_proj = p2_proj / p2_proj.w
-
-            p0_proj.x = (p0_proj.x + 1.0) * 0.5 * self.width
-            p0_proj.y = (p0_proj.y + 1.0) * 0.5 * self.height
-            p1_proj.x = (p1_proj.x + 1.0) * 0.5 * self.width
-            p1_proj.y = (p1_proj.y + 1.0) * 0.5 * self.height
-            p2_proj.x = (p2_proj.x + 1.0) * 0.5 * self.width
-            p2_proj.y = (p2_proj.y + 1.0) * 0.5 * self.height
-
-            tri_projected[0] = p0_proj
-            tri_projected[1] = p1_proj
-            tri_projected[2] = p2_proj
-
-            # Store the result
-            tri_projected[0] = p0_proj
-            tri_projected[1] = p1_proj
-            tri_projected[2] = p2_proj
-
-            # Calculate max depth (z)
-            avg_depth = max(p0_view.z, p1_view.z, p2_view.z)
-
-            # CALCULATE LIGHTING
-            # 1. Define Light Direction (Forward into the scene)
-            light_dir = Vector3(0.0, 0.0, -1.0)
-            light_dir = light_dir.normalize()
-
-            line1 = p1_trans - p0_trans
-            line2 = p2_trans - p0_trans
-            normal = line1.cross(line2).normalize()
-
-            dp = normal.dot(light_dir)
-            brightness = max(0.2, dp)
-
-            final_color = (
-                int(base_color[0] * brightness),
-                int(base_color[1] * brightness),
-                int(base_color[2] * brightness)
-            )
-
-            # Fetching flags from the original triangle 'tri'
-            triangles_to_draw.append(
-                (tri_projected, avg_depth, final_color, tri.edge_flags))
+        # --- STEP 1: MODEL-VIEW MATRICES ---
+        # One matrix product per instance instead of per vertex
+        model_views = [mat_view @ mat_world for mat_world in world_matrices]
+
+        if self.cache_size <= 0:
+            return self.build_draw_list(mesh, model_views, world_matrices, colors)
+
+        key = self.draw_list_key(mesh, model_views, world_matrices, colors)
+        cache = self.draw_cache
+        entry = cache.get(key)
+        # The mesh is kept in the entry so its id() can't be reused
+        if entry is not None and entry[0] is mesh:
+            cache.move_to_end(key)
+            self.cache_hits += 1
+            return entry[1]
+
+        self.cache_misses += 1
+        triangles_to_draw = self.build_draw_list(mesh, model_views, world_matrices, colors)
+        cache[key] = (mesh, triangles_to_draw)
+        cache.move_to_end(key)
+        while len(cache) > self.cache_size:
+            cache.popitem(last=False)
+        return triangles_to_draw
+
+    def build_draw_list(self, mesh, model_views, world_matrices, colors):
+        # The uncached path: transform, cull, project, light and sort
+        triangles_to_draw = []
+        mat_proj = self.mat_proj
+        half_w = 0.5 * self.width
+        half_h = 0.5 * self.height
+        # Screen rejection bounds: wholly past one of these is off screen
+        min_x = min_y = -REJECT_MARGIN
+        max_x = self.width + REJECT_MARGIN
+        max_y = self.height + REJECT_MARGIN
+        # Guard band in screen space, and the same bounds as view space
+        # planes for clipping (|x_ndc| <= G  <=>  G*z -+ sx*x >= 0)
+        guard_min_x = (1.0 - GUARD_BAND) * half_w
+        guard_max_x = (1.0 + GUARD_BAND) * half_w
+        guard_min_y = (1.0 - GUARD_BAND) * half_h
+        guard_max_y = (1.0 + GUARD_BAND) * half_h
+        sx = mat_proj.m[0][0]
+        sy = mat_proj.m[1][1]
+        clip_planes = (
+            (0.0, 0.0, 1.0, -NEAR_PLANE),
+            (-sx, 0.0, GUARD_BAND, 0.0), (sx, 0.0, GUARD_BAND, 0.0),
+            (0.0, -sy, GUARD_BAND, 0.0), (0.0, sy, GUARD_BAND, 0.0),
+        )
+
+        # 1. Define Light Direction (Forward into the scene)
+        light_dir = Vector3(0.0, 0.0, -1.0)
+
+        for instance, mat_world in enumerate(world_matrices):
+            base_color = colors[instance]
+            mat_model_view = model_views[instance]
+
+            # Transform each unique vertex once
+            # Loaders share Vector3 objects between adjacent triangles
+            vert_cache = {}
+
+            # LOOP THROUGH ALL TRIANGLES IN THE MESH
+            for tri in mesh.triangles:
+                transformed = []
+                for p in tri.p:
+                    cached = vert_cache.get(id(p))
+                    if cached is None:
+                        cached = (mat_world.multiply_vector(p),
+                                  mat_model_view.multiply_vector(p))
+                        vert_cache[id(p)] = cached
+                    transformed.append(cached)
+
+                p0_trans, p0_view = transformed[0]
+                p1_trans, p1_view = transformed[1]
+                p2_trans, p2_view = transformed[2]
+
+                line1 = p1_view - p0_view
+                line2 = p2_view - p0_view
+                normal_view = line1.cross(line2).normalize()
+                camera_ray = p0_view.normalize()
+                if normal_view.dot(camera_ray) > 0:
+                    continue
+
+                # --- NEAR PLANE CLIPPING ---
+                # Triangles crossing the plane are split, not dropped
+                views = (p0_view, p1_view, p2_view)
+                if (p0_view.z < NEAR_PLANE or p1_view.z < NEAR_PLANE
+                        or p2_view.z < NEAR_PLANE):
+                    # Clipped against the guard band too: no second pass
+                    pieces = [piece + (True,) for piece in
+                              clip_triangle(views, tri.edge_flags, tri.edge_ids, clip_planes)]
+                    if not pieces:
+                        continue  # Wholly behind the camera (or off screen)
+                    self.tris_clipped += 1
+                else:
+                    pieces = [(views, tri.edge_flags, tri.edge_ids, False)]
+
+                visible = []
+                while pieces:
+                    piece_views, edge_flags, edge_ids, clipped = pieces.pop()
+                    tri_projected = []
+                    for p_view in piece_views:
+                        p_proj = mat_proj.multiply_vector(p_view)
+                        if p_proj.w != 0:
+                            p_proj = p_proj / p_proj.w
+                        p_proj.x = (p_proj.x + 1.0) * half_w
+                        p_proj.y = (p_proj.y + 1.0) * half_h
+                        tri_projected.append(p_proj)
+
+                    # --- SCREEN REJECTION ---
+                    # Wholly outside the viewport: no draw call at all
+                    s0, s1, s2 = tri_projected
+                    if ((s0.x < min_x and s1.x < min_x and s2.x < min_x)
+                            or (s0.x > max_x and s1.x > max_x and s2.x > max_x)
+                            or (s0.y < min_y and s1.y < min_y and s2.y < min_y)
+                            or (s0.y > max_y and s1.y > max_y and s2.y > max_y)):
+                        self.tris_offscreen += 1
+                        continue
+
+                    # --- GUARD BAND ---
+                    # Corners far off screen: clip in view space, try again
+                    if not clipped and not (guard_min_x <= min(s0.x, s1.x, s2.x)
+                            and max(s0.x, s1.x, s2.x) <= guard_max_x
+                            and guard_min_y <= min(s0.y, s1.y, s2.y)
+                            and max(s0.y, s1.y, s2.y) <= guard_max_y):
+                        pieces.extend(piece + (True,) for piece in
+                                      clip_triangle(piece_views, edge_flags, edge_ids,
+                                                    clip_planes[1:]))
+                        self.tris_clipped += 1
+                        continue
+
+                    # Calculate max depth (z)
+                    avg_depth = max(v.z for v in piece_views)
+                    visible.append((tri_projected, avg_depth, edge_flags, edge_ids))
+
+                if not visible:
+                    continue
+
+                # CALCULATE LIGHTING (Whole triangle, shared by its pieces)
+                line1 = p1_trans - p0_trans
+                line2 = p2_trans - p0_trans
+                normal = line1.cross(line2).normalize()
+
+                dp = normal.dot(light_dir)
+                brightness = max(0.2, dp)
+
+                final_color = (
+                    int(base_color[0] * brightness),
+                    int(base_color[1] * brightness),
+                    int(base_color[2] * brightness)
+                )
+
+                # Flags and shared edge ids come from the original triangle
+                # 'tri' (clip_triangle hides the edges it creates)
+                for tri_projected, avg_depth, edge_flags, edge_ids in visible:
+                    triangles_to_draw.append(
+                        (tri_projected, avg_depth, final_color, edge_flags, instance,
+                         edge_ids))
 
         # --- SORTING (Painter's Algorithm) ---
         triangles_to_draw.sort(key=lambda x: x[1], reverse=True)
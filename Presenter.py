@@ -0,0 +1,127 @@
+import pygame
+
+# Rects covering at least 1/BIG_RECT_FRACTION of the screen are checked
+# for swallowing smaller ones (keeps the containment test cheap)
+BIG_RECT_FRACTION = 64
+
+
+class DirtyRectPresenter:
+    # Presents only the parts of the screen that changed
+    # Every frame: clear() erases what was drawn LAST frame, the
+    # renderer reports what it draws THIS frame through add(), and
+    # present() pushes the union of both to the display.
+    def __init__(self, screen, clear_color=(0, 0, 0), max_coverage=0.5, max_rects=512):
+        self.screen = screen
+        self.clear_color = clear_color
+        self.max_coverage = max_coverage  # Fraction of screen before full flip
+        self.max_rects = max_rects
+        self.screen_rect = screen.get_rect()
+
+        self.prev_rects = []
+        self.rects = []
+        self.full_redraw = True  # First frame is always a full flip
+
+        # Stats (for profiling)
+        self.last_mode = 'flip'
+        self.last_coverage = 1.0
+
+    def invalidate(self):
+        # Force a full clear + flip on the next frame (window exposed, resized...)
+        self.full_redraw = True
+
+    def clear(self):
+        if self.full_redraw:
+            self.screen.fill(self.clear_color)
+            return
+        for rect in self.prev_rects:
+            self.screen.fill(self.clear_color, rect)
+
+    def add(self, rect):
+        if rect is not None:
+            self.rects.append(rect)
+
+    def add_all(self, rects):
+        for rect in rects:
+            if rect is not None:
+                self.rects.append(rect)
+
+    def present(self):
+        screen_rect = self.screen_rect
+        screen_area = screen_rect.width * screen_rect.height
+        # Anything that didn't move is the same rect in both frames:
+        # push (and count) it once
+        dirty = []
+        seen = set()
+        for r in self.prev_rects + self.rects:
+            r = r.clip(screen_rect)
+            key = tuple(r)
+            if r.width and r.height and key not in seen:
+                seen.add(key)
+                dirty.append(r)
+
+        # Small rects inside a big one (stars or HUD over the planet)
+        # add nothing to the union
+        big = [r for r in dirty if r.width * r.height * BIG_RECT_FRACTION >= screen_area]
+        if big:
+            dirty = [r for r in dirty
+                     if not any(b is not r and b.contains(r) for b in big)]
+
+        # Rects that only partly overlap are still counted twice, so this
+        # over-estimates. That only makes the fallback kick in a little earlier.
+        area = sum(r.width * r.height for r in dirty)
+        coverage = area / float(screen_area)
+
+        if (self.full_redraw or len(dirty) > self.max_rects
+                or coverage > self.max_coverage):
+            pygame.display.flip()
+            self.last_mode = 'flip'
+        else:
+            pygame.display.update(dirty)
+            self.last_mode = 'rects'
+
+        self.last_coverage = coverage
+        self.full_redraw = False
+        self.prev_rects = self.rects
+        self.rects = []
+
+
+class ResolutionScaler:
+    # Picks an internal render scale that holds a target frame rate
+    # Render cost is roughly per pixel, so the scale moves with the
+    # square root of (target frame time / measured frame time).
+    def __init__(self, width, height, target_fps=60, min_scale=0.5, max_scale=1.0, smoothing=0.1, step=0.05):
+        self.width = width
+        self.height = height
+        self.target_ms = 1000.0 / target_fps
+        self.min_scale = min_scale
+        self.max_scale = max_scale
+        self.smoothing = smoothing  # EMA weight of the newest frame
+        self.step = step            # Scale is snapped to multiples of this
+
+        self.scale = max_scale
+        self.avg_ms = self.target_ms
+
+    def update(self, frame_ms):
+        # Feed in the last frame's work time (ms)
+        # Returns True when the render size changed
+        self.avg_ms += (frame_ms - self.avg_ms) * self.smoothing
+        if self.avg_ms <= 0:
+            return False
+
+        wanted = self.scale * (self.target_ms / self.avg_ms) ** 0.5
+        wanted = max(self.min_scale, min(self.max_scale, wanted))
+
+        # Snap so small jitter doesn't reallocate the surface every frame
+        snapped = round(wanted / self.step) * self.step
+        snapped = max(self.min_scale, min(self.max_scale, snapped))
+        if abs(snapped - self.scale) < 1e-9:
+            return False
+
+        self.scale = snapped
+        # Rescaling changes frame cost, restart from the target
+        self.avg_ms = self.target_ms
+        return True
+
+    def render_size(self):
+        return (max(1, int(self.width * self.scale)),
+                max(1, int(self.height * self.scale)))
@@ -0,0 +1,158 @@
+import gc
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+
+class StartupTimer:
+    # Wall-clock breakdown of startup, one entry per named phase
+    def __init__(self, start=None):
+        self.start = time.perf_counter() if start is None else start
+        self.phases = []
+
+    def record(self, name, seconds):
+        self.phases.append((name, seconds))
+
+    @contextmanager
+    def phase(self, name):
+        t = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - t))
+
+    def total(self):
+        return time.perf_counter() - self.start
+
+    def report(self):
+        lines = ["--- STARTUP ---"]
+        for name, seconds in self.phases:
+            lines.append(f"  {name:<20} {seconds * 1000:8.2f} ms")
+        lines.append(f"  {'total':<20} {self.total() * 1000:8.2f} ms")
+        return "\n".join(lines)
+
+
+class FrameMemoryProfiler:
+    # Per-frame allocation and GC pause stats
+    # GC pauses are timed through gc.callbacks (cheap, always on while
+    # the profiler runs). trace_allocations adds tracemalloc, which is
+    # slow: frame times are inflated, so use it to find allocation
+    # sites, not to measure the frame rate.
+    def __init__(self, trace_allocations=False, snapshot_every=60, top=8):
+        self.trace_allocations = trace_allocations
+        self.snapshot_every = snapshot_every  # Frames between snapshot diffs
+        self.top = top
+
+        self.frames = 0
+        self.gc_started = None
+        self.gc_pauses = {0: [], 1: [], 2: []}  # generation -> [seconds]
+        self.frame_gc = 0.0       # GC time inside the current frame
+        self.frame_gc_times = []  # Per frame total GC pause
+
+        # tracemalloc (bytes per frame)
+        self.frame_peaks = []     # Peak above the frame's starting size
+        self.frame_growth = []    # Net change over the frame
+        self.frame_start_size = 0
+        self.snapshot = None
+        self.top_sites = []       # Largest growth between the last two snapshots
+
+    def start(self):
+        gc.callbacks.append(self._gc_callback)
+        if self.trace_allocations:
+            tracemalloc.start()
+            self.snapshot = tracemalloc.take_snapshot()
+
+    def stop(self):
+        if self._gc_callback in gc.callbacks:
+            gc.callbacks.remove(self._gc_callback)
+        if self.trace_allocations and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    @contextmanager
+    def paused(self):
+        # Collections run inside are not recorded (e.g. our own
+        # gc.collect() in freeze_long_lived), only the sim's
+        attached = self._gc_callback in gc.callbacks
+        if attached:
+            gc.callbacks.remove(self._gc_callback)
+        try:
+            yield
+        finally:
+            self.gc_started = None
+            if attached:
+                gc.callbacks.append(self._gc_callback)
+
+    def _gc_callback(self, phase, info):
+        if phase == "start":
+            self.gc_started = time.perf_counter()
+        elif self.gc_started is not None:
+            pause = time.perf_counter() - self.gc_started
+            self.gc_pauses[info["generation"]].append(pause)
+            self.frame_gc += pause
+            self.gc_started = None
+
+    # --- PER FRAME ---
+
+    def begin_frame(self):
+        self.frame_gc = 0.0
+        if self.trace_allocations:
+            tracemalloc.reset_peak()
+            self.frame_start_size = tracemalloc.get_traced_memory()[0]
+
+    def end_frame(self):
+        self.frames += 1
+        self.frame_gc_times.append(self.frame_gc)
+        if not self.trace_allocations:
+            return
+
+        size, peak = tracemalloc.get_traced_memory()
+        self.frame_peaks.append(peak - self.frame_start_size)
+        self.frame_growth.append(size - self.frame_start_size)
+
+        if self.snapshot_every and self.frames % self.snapshot_every == 0:
+            snapshot = tracemalloc.take_snapshot().filter_traces(
+                (tracemalloc.Filter(False, tracemalloc.__file__),
+                 tracemalloc.Filter(False, __file__)))  # Not our own bookkeeping
+            stats = snapshot.compare_to(self.snapshot, "lineno")
+            self.top_sites = [s for s in stats[:self.top] if s.size_diff > 0]
+            self.snapshot = snapshot
+
+    # --- REPORT ---
+
+    def report(self):
+        lines = ["--- GC PAUSES ---"]
+        frames = max(1, self.frames)
+        for generation, pauses in self.gc_pauses.items():
+            if pauses:
+                lines.append(f"  gen {generation}: {len(pauses):6d} collections, "
+                             f"total {sum(pauses) * 1000:8.2f} ms, "
+                             f"max {max(pauses) * 1000:6.2f} ms")
+            else:
+                lines.append(f"  gen {generation}: {0:6d} collections")
+        hit = [t for t in self.frame_gc_times if t > 0]
+        lines.append(f"  frames with a pause: {len(hit)}/{self.frames}"
+                     f", worst frame {max(hit, default=0.0) * 1000:.2f} ms")
+        lines.append(f"  gc thresholds {gc.get_threshold()}, frozen objects {gc.get_freeze_count()}")
+
+        if self.trace_allocations:
+            lines.append("--- ALLOCATIONS (tracemalloc) ---")
+            if self.frame_peaks:
+                lines.append(f"  per frame peak:   avg {sum(self.frame_peaks) / frames / 1024:8.1f} KiB"
+                             f", max {max(self.frame_peaks) / 1024:8.1f} KiB")
+                lines.append(f"  per frame growth: avg {sum(self.frame_growth) / frames / 1024:8.1f} KiB")
+            if self.top_sites:
+                lines.append(f"  top growth over the last {self.snapshot_every} frames:")
+                for stat in self.top_sites:
+                    frame = stat.traceback[0]
+                    lines.append(f"    {frame.filename}:{frame.lineno}"
+                                 f"  +{stat.size_diff / 1024:.1f} KiB ({stat.count_diff:+d} blocks)")
+        return "\n".join(lines)
+
+
+def freeze_long_lived():
+    # Collect once, then move everything alive into the permanent
+    # generation (gc.freeze). Meshes, stars and fonts built during
+    # startup are never scanned again by later collections.
+    gc.collect()
+    gc.freeze()
+    return gc.get_freeze_count()
@@ -0,0 +1,220 @@
+import pygame
+from MatrixMath import Matrix4
+
+# Stars are reported to the presenter as one bounding rect per
+# STAR_TILE x STAR_TILE screen tile instead of one rect per pixel
+STAR_TILE = 64
+
+
+def render_mesh(screen, pipeline, mesh, camera, world_matrix, face_color=(255, 255, 255), wire_color=(0, 0, 0), draw_wires=True):
+    # A single mesh is just a batch of one instance
+    return render_instances(screen, pipeline, mesh, camera, [world_matrix],
+                     [face_color], [wire_color], draw_wires)
+
+
+def render_stars(screen, pipeline, stars, camera):
+    # Create Rotation Matrices
+    mat_rot_y = Matrix4.make_rotation_y(-camera.yaw)
+    mat_rot_x = Matrix4.make_rotation_x(camera.pitch)
+
+    # Combined Rotation Matrix
+    mat_view_rot = mat_rot_x @ mat_rot_y
+
+    white = (255, 255, 255)
+    width = pipeline.width
+    height = pipeline.height
+    tiles = {}  # (tile x, tile y) -> [min x, min y, max x, max y]
+
+    # Apply View Rotation + Projection to the whole sky at once
+    # (stars is a Vector3Array). The projection puts view z into w.
+    p_proj = stars.transform(pipeline.mat_proj @ mat_view_rot)
+    to_list = p_proj.backend.to_list
+
+    for x, y, w in zip(to_list(p_proj.x), to_list(p_proj.y), to_list(p_proj.w)):
+        # Check if it's behind us
+        if w < 0.1:
+            continue  # Star is behind player, no need to draw
+
+        # Perspective Divide + Screen Coordinates
+        screen_x = (x / w + 1.0) * 0.5 * width
+        screen_y = (1.0 - y / w) * 0.5 * height
+
+        if 0 <= screen_x < width and 0 <= screen_y < height:
+            px = int(screen_x)
+            py = int(screen_y)
+            screen.set_at((px, py), white)
+            key = (px // STAR_TILE, py // STAR_TILE)
+            box = tiles.get(key)
+            if box is None:
+                tiles[key] = [px, py, px, py]
+            else:
+                if px < box[0]:
+                    box[0] = px
+                elif px > box[2]:
+                    box[2] = px
+                if py < box[1]:
+                    box[1] = py
+                elif py > box[3]:
+                    box[3] = py
+
+    return [pygame.Rect(x0, y0, x1 - x0 + 1, y1 - y0 + 1)
+            for x0, y0, x1, y1 in tiles.values()]
+
+
+def render_instances(screen, pipeline, mesh, camera, world_matrices, colors, wire_colors=None, draw_wires=True):
+    # Draw many copies of one mesh from a single merged draw list
+    # Returns the screen rect touched (None if nothing was drawn)
+    processed_tris = pipeline.process_instances(
+        mesh, camera, world_matrices, colors)
+
+    # Shared edges are drawn once, by the LAST triangle in draw order
+    # that uses them, so nothing painted later can cover the line.
+    edge_owner = {}
+    if draw_wires:
+        for k, tri_data in enumerate(processed_tris):
+            instance = tri_data[4]
+            for edge_id in tri_data[5]:
+                if edge_id >= 0:
+                    edge_owner[(instance, edge_id)] = k
+
+    # Draw the triangles
+    draw_polygon = pygame.draw.polygon
+    draw_lines = pygame.draw.lines
+    drawn = []
+    for k, tri_data in enumerate(processed_tris):
+        tri_points, _, tri_color, _, instance, edge_ids = tri_data
+        points = [(tri_points[0].x, tri_points[0].y),
+                  (tri_points[1].x, tri_points[1].y),
+                  (tri_points[2].x, tri_points[2].y)]
+
+        # Wires never leave the triangle's bounds, so this rect covers both
+        drawn.append(draw_polygon(screen, tri_color, points))
+
+        if not draw_wires:
+            continue
+
+        # Edge i runs from points[i] to points[i + 1]
+        owned = [edge_id >= 0 and edge_owner.get((instance, edge_id)) == k
+                 for edge_id in edge_ids]
+        count = owned.count(True)
+        if count == 0:
+            continue
+
+        wire_color = wire_colors[instance] if wire_colors else (0, 0, 0)
+        if count == 3:
+            # Whole outline in one call
+            draw_lines(screen, wire_color, True, points, 1)
+        elif count == 2:
+            # Two edges always share a corner: start after the missing one
+            start = (owned.index(False) + 1) % 3
+            draw_lines(screen, wire_color, False,
+                       [points[start], points[(start + 1) % 3],
+                        points[(start + 2) % 3]], 1)
+        else:
+            i = owned.index(True)
+            draw_lines(screen, wire_color, False,
+                       [points[i], points[(i + 1) % 3]], 1)
+
+    if not drawn:
+        return None
+    return drawn[0].unionall(drawn[1:])
+
+
+def draw_vector_3d(screen, pipeline, camera, start_pos, vector, color):
+    # Draws the shaft and returns (arrowhead world matrix, shaft rect)
+    # Arrowheads are rendered together by draw_vectors()
+
+    # Draw the Shaft (Line)
+    end_pos = start_pos + vector
+
+    start_screen = pipeline.project_point(start_pos, camera)
+    end_screen = pipeline.project_point(end_pos, camera)
+
+    shaft_rect = None
+    if start_screen and end_screen:
+        # Dynamic Thickness: Thicker when closer (Simple depth cue)
+        # start_screen[2] is the Z-depth returned by project_point
+        depth = start_screen[2]
+        thickness = max(1, int(100 / depth)) if depth > 0 else 1
+
+        shaft_rect = pygame.draw.line(screen, color,
+                                      (start_screen[0], start_screen[1]),
+                                      (end_screen[0], end_screen[1]), thickness)
+
+    # Rotation
+    mat_rot = Matrix4.make_alignment(vector)
+
+    # Translation: Move to tip of line
+    # Scale is 1.0, so the scaling matrix is skipped
+    mat_rot.m[0][3] = end_pos.x
+    mat_rot.m[1][3] = end_pos.y
+    mat_rot.m[2][3] = end_pos.z
+
+    # Position * Rotation
+    return mat_rot, shaft_rect
+
+
+def draw_vectors(screen, pipeline, camera, mesh_arrow, start_pos, vectors):
+    # vectors: [(vector, color), ...]
+    # Returns the list of screen rects touched
+    arrow_matrices = []
+    arrow_colors = []
+    dirty = []
+    for vector, color in vectors:
+        mat_arrow, shaft_rect = draw_vector_3d(
+            screen, pipeline, camera, start_pos, vector, color)
+        arrow_matrices.append(mat_arrow)
+        arrow_colors.append(color)
+        dirty.append(shaft_rect)
+
+    # Render all arrowheads in one instanced batch
+    dirty.append(render_instances(screen, pipeline, mesh_arrow, camera,
+                                  arrow_matrices, arrow_colors, draw_wires=False))
+    return dirty
+
+
+def render_nodes(screen, pipeline, camera, scene):
+    # Draws every visible mesh node in the scene's draw order
+    dirty = []
+    for node in scene.draw_list(camera):
+        dirty.append(render_mesh(screen, pipeline, node.mesh, camera, node.world,
+                                 face_color=node.face_color, wire_color=node.wire_color,
+                                 draw_wires=node.draw_wires))
+    return dirty
+
+
+def render_scene(screen, pipeline, camera, scene, player, planet, starfield, mesh_arrow, show_vectors=True):
+    # Draws one full frame of the world (no HUD)
+    # Returns the list of screen rects touched
+    dirty = []
+    scene.reset_stats()
+    # --- DRAW BACKGROUND STARS ---
+    dirty.extend(render_stars(screen, pipeline, starfield.stars, camera))
+
+    # --- SYNC DYNAMIC NODES ---
+    # Rotation (and model fix) is cached on the ship between turns
+    scene.nodes["ship"].set_local(player.get_world_matrix())
+
+    # --- DRAW MESHES (Back to front) ---
+    dirty.extend(render_nodes(screen, pipeline, camera, scene))
+
+    # --- VECTOR VISUALIZATION ---
+    if show_vectors:
+        # Gravity (Red)
+        grav_dir = (planet.pos - player.pos).normalize() * 12.5
+
+        # Heading / Thrust (Yellow)
+        forward_vec = player.forward * 5.0
+
+        vectors = [
+            (player.vel * 2.0, (0, 255, 0)),  # Velocity (Green)
+            (grav_dir, (255, 0, 0)),
+            (forward_vec, (255, 255, 0)),
+        ]
+
+        # One sphere around the ship holds every shaft and arrowhead
+        reach = max(vector.magnitude() for vector, _ in vectors) + mesh_arrow.bounding_radius()
+        if not scene.is_occluded(camera.pos, player.pos, reach):
+            dirty.extend(draw_vectors(screen, pipeline, camera, mesh_arrow, player.pos, vectors))
+
+    return dirty
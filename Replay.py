@@ -0,0 +1,169 @@
+import mmap
+import operator
+import struct
+import sys
+from itertools import compress, count, islice
+from MatrixMath import Vector3
+from Telemetry import (HEADER, MAGIC, RECORD_FIELDS, V1_FIELDS, FIELD_INDEX,
+                       KEYFRAME_HEADER, KEYFRAME_MAGIC, KEYFRAME_SUFFIX)
+
+TIME_OFFSET = FIELD_INDEX['time'] * 8
+
+
+class FlightReplay:
+    # Plays back a telemetry file without re-running physics
+    # The file is memory mapped: only the pages around the current
+    # playback time are ever read, so long flights cost no RAM.
+    def __init__(self, path, keyframe_interval=1.0):
+        self.path = path
+        self.file = open(path, 'rb')
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, _, fields, self.star_seed = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC or fields not in (V1_FIELDS, RECORD_FIELDS):
+            raise ValueError(f"{path} is not a telemetry file")
+
+        # Older files have fewer fields per row (no roll)
+        self.fields = {name: k for name, k in FIELD_INDEX.items() if k < fields}
+        self.record_struct = struct.Struct('<%dd' % fields)
+        self.record_bytes = self.record_struct.size
+
+        self.count = (len(self.data) - HEADER.size) // self.record_bytes
+        if self.count == 0:
+            raise ValueError(f"{path} has no records")
+
+        # Seeking assumes time only moves forward. A file where it jumps
+        # back (quickload while recording) is played up to the jump.
+        rewind = self.first_rewind(fields)
+        if rewind is not None:
+            print(f"Replay: {path} jumps back in time at row {rewind}, "
+                  f"ignoring the {self.count - rewind} rows after it")
+            self.count = rewind
+
+        self.keyframes, self.keyframe_interval = self.load_keyframes(
+            keyframe_interval)
+
+        self.start_time = self.time_at(0)
+        self.end_time = self.time_at(self.count - 1)
+
+        # Playback state
+        self.time = self.start_time
+        self.speed = 1.0   # Negative plays backwards
+        self.paused = False
+
+    # --- KEYFRAMES ---
+
+    def load_keyframes(self, fallback_interval):
+        try:
+            with open(self.path + KEYFRAME_SUFFIX, 'rb') as f:
+                raw = f.read()
+            magic, _, _, interval = KEYFRAME_HEADER.unpack_from(raw, 0)
+            if magic == KEYFRAME_MAGIC:
+                body = raw[KEYFRAME_HEADER.size:]
+                count = len(body) // 8
+                keyframes = list(struct.unpack_from('<%dq' % count, body))
+                # Entries can point past the last row if the run was cut short
+                return [min(k, self.count - 1) for k in keyframes], interval
+        except (FileNotFoundError, struct.error):
+            pass
+
+        # No index on disk (older or crashed recording): one scan to rebuild
+        print(f"Replay: rebuilding keyframe index for {self.path}")
+        keyframes = []
+        next_time = 0.0
+        for i in range(self.count):
+            t = self.time_at(i)
+            while t >= next_time:
+                keyframes.append(i)
+                next_time += fallback_interval
+        return keyframes, fallback_interval
+
+    def first_rewind(self, fields):
+        # Index of the first row with an earlier time than the row before
+        # it, or None. One pass over the file, without Python-level loops.
+        if sys.byteorder == 'little':
+            # Rows are little endian doubles: view the time column in place
+            end = HEADER.size + self.count * self.record_bytes
+            times = memoryview(self.data)[HEADER.size:end].cast('d')[FIELD_INDEX['time']::fields]
+        else:
+            times = [self.time_at(i) for i in range(self.count)]
+        backwards = map(operator.gt, times, islice(times, 1, None))
+        return next(compress(count(1), backwards), None)
+
+    # --- RECORD ACCESS ---
+
+    def time_at(self, i):
+        return struct.unpack_from(
+            '<d', self.data, HEADER.size + i * self.record_bytes + TIME_OFFSET)[0]
+
+    def record(self, i):
+        return self.record_struct.unpack_from(self.data, HEADER.size + i * self.record_bytes)
+
+    def find(self, t):
+        # Index of the last record with time <= t
+        # The keyframe bucket gives a starting row directly, then the
+        # scan is bounded by the rows inside one keyframe interval.
+        if t <= self.start_time:
+            return 0
+        bucket = int(t / self.keyframe_interval)
+        if bucket < len(self.keyframes):
+            i = max(0, self.keyframes[bucket] - 1)
+        else:
+            i = self.keyframes[-1] if self.keyframes else 0
+
+        last = self.count - 1
+        while i < last and self.time_at(i + 1) <= t:
+            i += 1
+        return i
+
+    def sample(self, t):
+        # Linearly interpolated state at sim time t (as a dict of FIELDS)
+        fields = self.fields
+        i = self.find(t)
+        a = self.record(i)
+        if i + 1 >= self.count:
+            state = dict(zip(fields, a))
+            state.setdefault('roll', 0.0)
+            return state
+
+        b = self.record(i + 1)
+        t0 = a[fields['time']]
+        t1 = b[fields['time']]
+        f = (t - t0) / (t1 - t0) if t1 > t0 else 0.0
+        f = max(0.0, min(1.0, f))
+        state = {name: a[k] + (b[k] - a[k]) * f for name, k in fields.items()}
+
+        # Yaw/roll wrap at +-180: blend along the short way round
+        for name in ('yaw', 'roll'):
+            k = fields.get(name)
+            if k is not None:
+                delta = (b[k] - a[k] + 180.0) % 360.0 - 180.0
+                state[name] = a[k] + delta * f
+
+        # Discrete fields are not blended
+        for name in ('step', 'time_warp', 'controls'):
+            state[name] = a[fields[name]]
+        state.setdefault('roll', 0.0)
+        return state
+
+    # --- PLAYBACK ---
+
+    def seek(self, t):
+        self.time = max(self.start_time, min(self.end_time, t))
+
+    def advance(self, real_dt):
+        # real_dt: wall-clock seconds since last frame
+        if not self.paused:
+            self.seek(self.time + real_dt * self.speed)
+
+    def apply(self, craft):
+        # Drive a Spacecraft from the recorded state at the playback time
+        state = self.sample(self.time)
+        craft.pos = Vector3(state['pos_x'], state['pos_y'], state['pos_z'])
+        craft.vel = Vector3(state['vel_x'], state['vel_y'], state['vel_z'])
+        craft.set_euler(state['yaw'], state['pitch'], state['roll'])
+        return state
+
+    def close(self):
+        self.data.close()
+        self.file.close()
@@ -0,0 +1,238 @@
+import math
+from MatrixMath import Vector3, Matrix4
+
+
+class SceneNode:
+    # A transform in the scene graph, optionally carrying a mesh to draw
+    # world = parent.world @ local, recomputed only when this node or
+    # one of its ancestors has changed since the last lookup.
+    def __init__(self, name, mesh=None, face_color=(255, 255, 255), wire_color=(0, 0, 0), draw_wires=True):
+        self.name = name
+        self.mesh = mesh
+        self.face_color = face_color
+        self.wire_color = wire_color
+        self.draw_wires = draw_wires
+        self.visible = True
+        # Model space bounding sphere radius about the node origin
+        # None: never occlusion culled
+        self.bound_radius = None
+
+        self.parent = None
+        self.children = []
+
+        self.local = Matrix4()
+        self._world = Matrix4()
+        self._inverse = None  # world.inverse_affine(), built on demand
+        self._radius = None   # bound_radius scaled into world space
+        self.dirty = True
+
+    # --- HIERARCHY ---
+
+    def add(self, child):
+        if child.parent is not None:
+            child.parent.remove(child)
+        child.parent = self
+        self.children.append(child)
+        child.invalidate()
+        return child
+
+    def remove(self, child):
+        self.children.remove(child)
+        child.parent = None
+        child.invalidate()
+
+    def walk(self):
+        # Depth first, parents before children
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+    # --- TRANSFORMS ---
+
+    def invalidate(self):
+        # A dirty node always has dirty descendants (a child can only be
+        # cleaned through its parent), so the walk can stop early.
+        if self.dirty:
+            return
+        self.dirty = True
+        self._inverse = None
+        self._radius = None
+        for child in self.children:
+            child.invalidate()
+
+    def set_local(self, matrix):
+        self.local = matrix
+        self.invalidate()
+
+    def set_position(self, x, y, z):
+        # Move without touching rotation/scale
+        m = self.local.m
+        m[0][3] = x
+        m[1][3] = y
+        m[2][3] = z
+        self.invalidate()
+
+    @property
+    def world(self):
+        if self.dirty:
+            if self.parent is None:
+                self._world = self.local
+            else:
+                self._world = self.parent.world @ self.local
+            self.dirty = False
+        return self._world
+
+    @property
+    def world_inverse(self):
+        # Only ray queries need it, so it is not kept up to date every frame
+        if self._inverse is None:
+            self._inverse = self.world.inverse_affine()
+        return self._inverse
+
+    @property
+    def world_radius(self):
+        # Scaled by the largest axis scale of the world matrix
+        if self._radius is None and self.bound_radius is not None:
+            m = self.world.m
+            scale = max(math.sqrt(m[0][k] ** 2 + m[1][k] ** 2 + m[2][k] ** 2)
+                        for k in range(3))
+            self._radius = self.bound_radius * scale
+        return self._radius
+
+    def world_position(self):
+        m = self.world.m
+        return Vector3(m[0][3], m[1][3], m[2][3])
+
+
+class Scene:
+    # Owns the node tree and decides draw order between meshes
+    # Top level nodes have no parent, so their world matrix is just
+    # their local one (no identity root to multiply through).
+    def __init__(self):
+        self.roots = []
+        self.nodes = {}  # name -> node
+
+        # Horizon culling: anything with occludes(eye, center, radius),
+        # e.g. a Planet. Objects fully hidden behind one are not drawn.
+        self.occluders = []
+        self.cull_stats = {'tested': 0, 'culled': 0}  # Per frame, for profiling
+
+    def add(self, node, parent=None):
+        if parent is None:
+            self.roots.append(node)
+        else:
+            parent.add(node)
+        for child in node.walk():
+            self.nodes[child.name] = child
+        return node
+
+    def remove(self, node):
+        for child in node.walk():
+            self.nodes.pop(child.name, None)
+        if node.parent is None:
+            self.roots.remove(node)
+        else:
+            node.parent.remove(node)
+
+    def walk(self):
+        for node in self.roots:
+            yield from node.walk()
+
+    # --- CULLING ---
+
+    def reset_stats(self):
+        self.cull_stats['tested'] = 0
+        self.cull_stats['culled'] = 0
+
+    def is_occluded(self, eye, center, radius):
+        stats = self.cull_stats
+        stats['tested'] += 1
+        for occluder in self.occluders:
+            if occluder.occludes(eye, center, radius):
+                stats['culled'] += 1
+                return True
+        return False
+
+    def draw_list(self, camera):
+        # Painter's order between meshes: farthest node origin first.
+        # Triangles are depth sorted again inside each mesh by the Pipeline.
+        # The sort is stable, so ties keep the order nodes were added in.
+        cam = camera.pos
+        nodes = []
+        for node in self.walk():
+            if node.mesh is None or not node.visible:
+                continue
+            # Skip hidden objects before any per-triangle work
+            if (node.bound_radius is not None and self.occluders
+                    and self.is_occluded(cam, node.world_position(), node.world_radius)):
+                continue
+            nodes.append(node)
+        nodes.sort(key=lambda node: cam.distance_to(node.world_position()),
+                   reverse=True)
+        return nodes
+
+    def raycast(self, origin, direction, max_dist=math.inf, any_hit=False):
+        # First mesh hit along origin + t * direction (world space)
+        # Returns (node, t, triangle index) or None. The ray is moved into
+        # each node's model space rather than moving the mesh into world
+        # space. The direction is not renormalized there, so t stays in
+        # world units even when the node is scaled.
+        best = None
+        for node in self.walk():
+            bvh = node.mesh.bvh if node.mesh is not None else None
+            if bvh is None or not node.visible:
+                continue
+            inv = node.world_inverse.m
+            local_origin = Vector3(
+                inv[0][0] * origin.x + inv[0][1] * origin.y + inv[0][2] * origin.z + inv[0][3],
+                inv[1][0] * origin.x + inv[1][1] * origin.y + inv[1][2] * origin.z + inv[1][3],
+                inv[2][0] * origin.x + inv[2][1] * origin.y + inv[2][2] * origin.z + inv[2][3])
+            local_dir = Vector3(
+                inv[0][0] * direction.x + inv[0][1] * direction.y + inv[0][2] * direction.z,
+                inv[1][0] * direction.x + inv[1][1] * direction.y + inv[1][2] * direction.z,
+                inv[2][0] * direction.x + inv[2][1] * direction.y + inv[2][2] * direction.z)
+
+            hit = bvh.intersect(local_origin, local_dir, max_dist, any_hit)
+            if hit is not None:
+                best = (node, hit[0], hit[1])
+                if any_hit:
+                    return best
+                max_dist = hit[0]  # Later nodes must beat this hit
+        return best
+
+    def line_of_sight(self, a, b, ignore=()):
+        # True if nothing (except nodes in 'ignore') blocks the segment a -> b
+        # The direction is the full segment, so t < 1 means "before b"
+        hidden = []
+        for node in ignore:
+            hidden.append((node, node.visible))
+            node.visible = False
+        try:
+            return self.raycast(a, b - a, max_dist=1.0, any_hit=True) is None
+        finally:
+            for node, visible in hidden:
+                node.visible = visible
+
+
+def build_scene(planet, mesh_planet, mesh_ship):
+    # The default world: one planet and the player's ship
+    scene = Scene()
+
+    # Model Matrix = Translate * Scale (static, built once)
+    scale = planet.radius
+    mat_planet = Matrix4.make_translation(
+        planet.pos.x, planet.pos.y, planet.pos.z) @ Matrix4.make_scaling(scale, scale, scale)
+    node = SceneNode("planet", mesh_planet, face_color=(0, 0, 200),
+                     wire_color=(0, 150, 0), draw_wires=False)
+    node.set_local(mat_planet)
+    scene.add(node)
+
+    # Ship transform is synced from the Spacecraft every frame
+    node = SceneNode("ship", mesh_ship, face_color=(150, 150, 150),
+                     wire_color=(255, 255, 255))
+    node.bound_radius = mesh_ship.bounding_radius()
+    scene.add(node)
+
+    # The planet hides whatever is behind its horizon
+    scene.occluders.append(planet)
+    return scene
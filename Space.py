@@ -1,18 +1,26 @@
 import random
 import math
-from MatrixMath import Vector3
+from MatrixMath import Vector3, Vector3Array
 
 
 class Starfield:
-    def __init__(self, num_stars=1000):
-        self.stars = []
+    def __init__(self, num_stars=1000, seed=None):
+        # Always run from a known seed so the sky can be reproduced
+        # (checkpoints store it). No seed given -> pick one.
+        if seed is None:
+            seed = random.randrange(2**32)
+        self.seed = seed
+        self.num_stars = num_stars
 
+        # Built as columns, stored as one Vector3Array
+        xs, ys, zs = [], [], []
+        rng = random.Random(seed)
         for _ in range(num_stars):
             # Generate random spherical coordinates
             # Yaw: 0 to 360
-            yaw = random.uniform(0, 360)
+            yaw = rng.uniform(0, 360)
             # Pitch: -90 to 90
-            pitch = random.uniform(-90, 90)
+            pitch = rng.uniform(-90, 90)
 
             # Convert to Cartesian (x, y, z) direction vector
             rad_yaw = math.radians(yaw)
@@ -23,7 +31,11 @@ class Starfield:
             z = math.cos(rad_yaw) * math.cos(rad_pitch)
 
             # Store this normalized vector
-            self.stars.append(Vector3(x, y, z))
+            xs.append(x)
+            ys.append(y)
+            zs.append(z)
+
+        self.stars = Vector3Array.from_columns(xs, ys, zs)
 
 
 class Planet:
@@ -31,3 +43,29 @@ class Planet:
         self.pos = Vector3(x, y, z)
         self.radius = radius
         self.mass = mass  # For Gravitational calculations
+
+    def occludes(self, eye, center, radius):
+        # True if a sphere (center, radius) is completely hidden behind
+        # the planet as seen from 'eye'. The planet's silhouette is a
+        # cone from the eye with half angle alpha = asin(R / d); the
+        # sphere is hidden if it fits inside the cone (beta + gamma <= alpha)
+        # and starts beyond the horizon distance sqrt(d^2 - R^2).
+        to_planet = self.pos - eye
+        d = to_planet.magnitude()
+        if d <= self.radius:
+            return False  # Eye inside the planet: no sensible horizon
+
+        to_object = center - eye
+        s = to_object.magnitude()
+        if s <= radius:
+            return False  # Eye inside the object
+
+        horizon = math.sqrt(d * d - self.radius * self.radius)
+        if s - radius < horizon:
+            return False
+
+        alpha = math.asin(self.radius / d)
+        cos_beta = to_planet.dot(to_object) / (d * s)
+        beta = math.acos(max(-1.0, min(1.0, cos_beta)))
+        gamma = math.asin(radius / s)
+        return beta + gamma <= alpha
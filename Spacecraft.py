@@ -1,6 +1,8 @@
 import math
-import pygame
-from MatrixMath import Vector3, Matrix4
+from MatrixMath import Vector3, Matrix4, Quaternion
+
+WORLD_UP = Vector3(0, 1, 0)
+PITCH_LIMIT = 89.0  # Degrees above/below the horizon
 
 
 class Spacecraft:
@@ -10,11 +12,145 @@ class Spacecraft:
         self.vel = Vector3(0, 0, 0)
 
         # Orientation
-        self.yaw = 0.0   # Left/Right
-        self.pitch = 0.0  # Up/Down
+        # The quaternion is the source of truth; yaw/pitch/roll, the
+        # basis vectors and the model matrix are derived from it and
+        # cached until the next rotation.
+        self.attitude = Quaternion()
+        self._cache = {}
+
+        # Rocket model faces +X by default
+        self.model_fix = Matrix4.make_rotation_x(90)
 
         # Physics Constants
         self.acceleration = 0.05
+        self.roll_rate = 2.0  # Degrees per frame
+
+    # --- ATTITUDE ---
+
+    def set_attitude(self, q):
+        self.attitude = q.normalize()
+        self._cache.clear()
+
+    def set_euler(self, yaw, pitch, roll=0.0):
+        self.set_attitude(Quaternion.from_euler(yaw, pitch, roll))
+
+    def rotate(self, d_yaw=0.0, d_pitch=0.0, d_roll=0.0):
+        # Yaw turns about the world up axis (like the old Euler yaw),
+        # pitch and roll about the ship's own axes, so there is no
+        # gimbal lock once the ship is rolled.
+        # The nose never passes PITCH_LIMIT (see clamp_pitch).
+        if d_pitch:
+            d_pitch = self.clamp_pitch(d_pitch)
+        q = self.attitude
+        if d_yaw:
+            q = Quaternion.from_axis_angle(WORLD_UP, d_yaw) * q
+        if d_pitch:
+            q = q * Quaternion.from_axis_angle(Vector3(1, 0, 0), d_pitch)
+        if d_roll:
+            q = q * Quaternion.from_axis_angle(Vector3(0, 0, 1), d_roll)
+        self.set_attitude(q)
+
+    def clamp_pitch(self, d_pitch):
+        # Largest part of a local pitch step that keeps |pitch| <= PITCH_LIMIT
+        # Pitching by t about the ship's X axis moves the nose in the
+        # forward/up plane: forward.y(t) = fy cos t - uy sin t, which is
+        # A cos(t + phi). When the ship is rolled that curve can peak
+        # over the pole inside one step and come back down, so the
+        # whole arc is checked, not just where it ends.
+        fy = self.forward.y
+        uy = self.up.y
+        amp = math.hypot(fy, uy)
+        limit = math.sin(math.radians(PITCH_LIMIT))
+        if amp <= limit:
+            return d_pitch  # This axis can't reach the limit
+
+        phi = math.atan2(uy, fy)
+        step = math.radians(d_pitch)
+        full_turn = 2.0 * math.pi
+
+        def pitch_y(t):
+            return amp * math.cos(t + phi)
+
+        # Already at the limit: only allow moving back
+        if abs(fy) >= limit - 1e-12:
+            probe = math.copysign(1e-6, step)
+            if abs(pitch_y(probe)) > abs(fy):
+                return 0.0
+
+        # First t along the step where |forward.y| reaches the limit
+        first = abs(step)
+        for target in (limit, -limit):
+            base = math.acos(target / amp)
+            for root in (base - phi, -base - phi):
+                t = root % full_turn if step > 0 else -((-root) % full_turn)
+                if 1e-12 < abs(t) < first:
+                    first = abs(t)
+        return math.degrees(math.copysign(first, step))
+
+    def _cached(self, key, build):
+        value = self._cache.get(key)
+        if value is None:
+            value = build()
+            self._cache[key] = value
+        return value
+
+    @property
+    def forward(self):
+        return self._cached('forward', lambda: self.attitude.rotate(Vector3(0, 0, 1)))
+
+    @property
+    def up(self):
+        return self._cached('up', lambda: self.attitude.rotate(Vector3(0, 1, 0)))
+
+    @property
+    def right(self):
+        return self._cached('right', lambda: self.attitude.rotate(Vector3(1, 0, 0)))
+
+    @property
+    def rotation_matrix(self):
+        return self._cached('rotation', self.attitude.to_matrix)
+
+    def get_world_matrix(self):
+        # Translation * Rotation * Model fix
+        # Only the translation column changes between rotations
+        model = self._cached('model', lambda: self.rotation_matrix @ self.model_fix)
+        mat = Matrix4()
+        mat.m = [row[:] for row in model.m]
+        mat.m[0][3] = self.pos.x
+        mat.m[1][3] = self.pos.y
+        mat.m[2][3] = self.pos.z
+        return mat
+
+    # Euler angles (degrees), derived for the camera, HUD and files
+    # forward = (sin(yaw)cos(pitch), -sin(pitch), cos(yaw)cos(pitch))
+
+    @property
+    def yaw(self):
+        return self._cached('yaw', lambda: math.degrees(
+            math.atan2(self.forward.x, self.forward.z)))
+
+    @yaw.setter
+    def yaw(self, value):
+        self.set_euler(value, self.pitch, self.roll)
+
+    @property
+    def pitch(self):
+        return self._cached('pitch', lambda: math.degrees(
+            math.asin(max(-1.0, min(1.0, -self.forward.y)))))
+
+    @pitch.setter
+    def pitch(self, value):
+        self.set_euler(self.yaw, value, self.roll)
+
+    @property
+    def roll(self):
+        # right.y = sin(roll)cos(pitch), up.y = cos(roll)cos(pitch)
+        return self._cached('roll', lambda: math.degrees(
+            math.atan2(self.right.y, self.up.y)))
+
+    @roll.setter
+    def roll(self, value):
+        self.set_euler(self.yaw, self.pitch, value)
 
     # --- GRAVITY APPLICATION ---
 
@@ -70,29 +206,38 @@ class Spacecraft:
                 self.pos.y = planet.pos.y + (ny * surface_level)
                 self.pos.z = planet.pos.z + (nz * surface_level)
 
+    # --- FULL PHYSICS STEP ---
+    def step(self, planet, keys, mouse_delta, dt=1.0, controls_enabled=True):
+        # Gravity -> controls/integration -> surface collision
+        # Shared by the interactive loop and headless fast-forward
+        self.apply_gravity(planet, dt=dt)
+        self.update(keys, mouse_delta, dt=dt, controls_enabled=controls_enabled)
+        self.check_collision(planet)
+
     # --- UPDATE FUNCTION ---
     def update(self, keys, mouse_delta, dt=1.0, controls_enabled=True):
         # 1. ROTATION (Independent of Time Warp)
+        # Attitude caches are only invalidated when there is input
         if controls_enabled:
+            # pygame is only needed for key codes, so headless runs
+            # (controls disabled) never have to import it
+            import pygame
             dx, dy = mouse_delta
             sensitivity = 0.2
-            self.yaw += dx * sensitivity
-            self.pitch -= dy * sensitivity
-
-        # Clamp Pitch
-        if self.pitch > 89.0:
-            self.pitch = 89.0
-        if self.pitch < -89.0:
-            self.pitch = -89.0
-
-        # 2. CALCULATE FORWARD (Using Trig)
-        rad_yaw = math.radians(self.yaw)
-        rad_pitch = math.radians(self.pitch)
-
-        fx = math.sin(rad_yaw) * math.cos(rad_pitch)
-        fy = -math.sin(rad_pitch)
-        fz = math.cos(rad_yaw) * math.cos(rad_pitch)
-        forward = Vector3(fx, fy, fz)
+            d_yaw = dx * sensitivity
+            d_pitch = -dy * sensitivity
+            d_roll = 0.0
+            if keys[pygame.K_q]:
+                d_roll -= self.roll_rate
+            if keys[pygame.K_e]:
+                d_roll += self.roll_rate
+
+            # Pitch is clamped inside rotate()
+            if d_yaw or d_pitch or d_roll:
+                self.rotate(d_yaw, d_pitch, d_roll)
+
+        # 2. FORWARD (Cached from the attitude)
+        forward = self.forward
 
         # 3. THRUST (Scaled by dt)
         # Engine gets stronger with time warp to keep up
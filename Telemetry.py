@@ -0,0 +1,179 @@
+import array
+import struct
+import sys
+import threading
+
+# --- FILE FORMAT ---
+# Header (16 bytes): magic, version, fields per record, starfield seed
+# (files from before the seed was stored have 0 there)
+# Records: FIELDS float64 values each, little endian, back to back
+# Version 1 files have no 'roll' field (the first 12 fields only)
+MAGIC = b'RKTTLM\x00\x00'
+VERSION = 2
+HEADER = struct.Struct('<8sHHI')
+
+# --- KEYFRAME INDEX (<path>.kf) ---
+# Header (20 bytes): magic, version, reserved, interval (sim seconds)
+# Entry k (int64): first record with time >= k * interval
+KEYFRAME_MAGIC = b'RKTTKF\x00\x00'
+KEYFRAME_HEADER = struct.Struct('<8sHHd')
+KEYFRAME_SUFFIX = '.kf'
+
+FIELDS = (
+    'step', 'time',
+    'pos_x', 'pos_y', 'pos_z',
+    'vel_x', 'vel_y', 'vel_z',
+    'yaw', 'pitch',
+    'time_warp', 'controls',
+    'roll',
+)
+V1_FIELDS = 12
+RECORD_FIELDS = len(FIELDS)
+RECORD_BYTES = RECORD_FIELDS * 8
+FIELD_INDEX = {name: i for i, name in enumerate(FIELDS)}
+
+# Control state bits (stored in the 'controls' field)
+CTRL_THRUST_FORWARD = 1
+CTRL_THRUST_BACK = 2
+CTRL_ENABLED = 4
+
+
+def encode_controls(thrust_forward, thrust_back, controls_enabled):
+    bits = 0
+    if thrust_forward:
+        bits |= CTRL_THRUST_FORWARD
+    if thrust_back:
+        bits |= CTRL_THRUST_BACK
+    if controls_enabled:
+        bits |= CTRL_ENABLED
+    return bits
+
+
+def _le_bytes(values):
+    # array.tobytes() is native order; the files are always little endian.
+    # 'values' must be a fresh array (a slice), it is swapped in place.
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values.tobytes()
+
+
+class TelemetryRecorder:
+    # Records one row per physics step into a preallocated ring buffer
+    # A background thread flushes the buffer to disk in large chunks,
+    # so record() is just a handful of array stores.
+    def __init__(self, path, star_seed=0, capacity=65536, chunk_records=4096, flush_interval=1.0, keyframe_interval=1.0):
+        self.path = path
+        self.star_seed = star_seed  # So exports draw the sky that was flown under
+        self.capacity = capacity
+        self.chunk_records = min(chunk_records, capacity)
+        self.flush_interval = flush_interval
+
+        # Preallocated storage: capacity * RECORD_FIELDS doubles
+        self.buffer = array.array('d', bytes(capacity * RECORD_BYTES))
+        self.head = 0      # Total records written into the ring
+        self.flushed = 0   # Total records written to disk
+        self.dropped = 0   # Records lost because the writer fell behind
+
+        # Keyframe index: one entry per keyframe_interval of sim time
+        self.keyframe_interval = keyframe_interval
+        self.next_keyframe_time = 0.0
+        self.keyframes = []
+        self.keyframes_flushed = 0
+
+        self.cond = threading.Condition()
+        self.closing = False
+
+        self.file = open(path, 'wb')
+        self.file.write(HEADER.pack(MAGIC, VERSION, RECORD_FIELDS, star_seed))
+        self.keyframe_file = open(path + KEYFRAME_SUFFIX, 'wb')
+        self.keyframe_file.write(KEYFRAME_HEADER.pack(
+            KEYFRAME_MAGIC, VERSION, 0, keyframe_interval))
+
+        self.thread = threading.Thread(
+            target=self._writer, name="TelemetryWriter", daemon=True)
+        self.thread.start()
+
+    # --- PRODUCER (Physics thread) ---
+
+    def record(self, step, sim_time, craft, time_warp, controls):
+        head = self.head
+        if head - self.flushed >= self.capacity:
+            self.dropped += 1  # Never block the sim on disk I/O
+            return
+
+        buf = self.buffer
+        i = (head % self.capacity) * RECORD_FIELDS
+        pos = craft.pos
+        vel = craft.vel
+        buf[i] = step
+        buf[i + 1] = sim_time
+        buf[i + 2] = pos.x
+        buf[i + 3] = pos.y
+        buf[i + 4] = pos.z
+        buf[i + 5] = vel.x
+        buf[i + 6] = vel.y
+        buf[i + 7] = vel.z
+        buf[i + 8] = craft.yaw
+        buf[i + 9] = craft.pitch
+        buf[i + 10] = time_warp
+        buf[i + 11] = controls
+        buf[i + 12] = craft.roll
+
+        # Keyframe bookkeeping: one comparison on most steps
+        # Large time warps can cross several intervals in one step
+        while sim_time >= self.next_keyframe_time:
+            self.keyframes.append(head)
+            self.next_keyframe_time += self.keyframe_interval
+
+        # Publish the row only after it is fully written
+        self.head = head + 1
+        if self.head - self.flushed >= self.chunk_records:
+            with self.cond:
+                self.cond.notify()
+
+    # --- CONSUMER (Writer thread) ---
+
+    def _writer(self):
+        while True:
+            with self.cond:
+                if not self.closing and self.head - self.flushed < self.chunk_records:
+                    self.cond.wait(self.flush_interval)
+                closing = self.closing
+            self._flush_pending()
+            if closing:
+                return
+
+    def _flush_pending(self):
+        # Keyframes first: they only reference rows up to 'head'
+        kf_end = len(self.keyframes)
+        if kf_end > self.keyframes_flushed:
+            self.keyframe_file.write(
+                _le_bytes(array.array('q', self.keyframes[self.keyframes_flushed:kf_end])))
+            self.keyframes_flushed = kf_end
+
+        start = self.flushed
+        end = self.head
+        if end == start:
+            return
+
+        # Rows in [start, end) are not touched by record() until
+        # 'flushed' moves past them, so they can be copied without a lock.
+        first = (start % self.capacity) * RECORD_FIELDS
+        last = (end % self.capacity) * RECORD_FIELDS
+        if first < last:
+            self.file.write(_le_bytes(self.buffer[first:last]))
+        else:
+            # Wrapped around the end of the ring
+            self.file.write(_le_bytes(self.buffer[first:]))
+            self.file.write(_le_bytes(self.buffer[:last]))
+        self.flushed = end
+
+    def close(self):
+        with self.cond:
+            self.closing = True
+            self.cond.notify()
+        self.thread.join()
+        self.file.close()
+        self.keyframe_file.close()
+        if self.dropped:
+            print(f"Telemetry: dropped {self.dropped} records (writer fell behind)")
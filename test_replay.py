@@ -0,0 +1,50 @@
+import pytest
+
+from Spacecraft import Spacecraft
+from Telemetry import TelemetryRecorder
+from Replay import FlightReplay
+
+
+def record_flight(path, times, star_seed=0):
+    recorder = TelemetryRecorder(str(path), star_seed=star_seed)
+    ship = Spacecraft(0, 0, 0)
+    for step, t in enumerate(times):
+        ship.pos.x = t
+        recorder.record(step, t, ship, 1.0, 0)
+    recorder.close()
+
+
+def test_times_are_seekable(tmp_path):
+    path = tmp_path / "flight.tlm"
+    record_flight(path, [k / 60.0 for k in range(300)])
+    replay = FlightReplay(str(path))
+    try:
+        assert replay.count == 300
+        assert replay.end_time == pytest.approx(299 / 60.0)
+        assert replay.sample(2.5)['pos_x'] == pytest.approx(2.5)
+    finally:
+        replay.close()
+
+
+def test_playback_stops_where_time_jumps_back(tmp_path):
+    # 0-5 s, then a rewind to 2 s and 2 more seconds
+    path = tmp_path / "rewound.tlm"
+    record_flight(path, [k / 60.0 for k in range(301)] +
+                  [2.0 + k / 60.0 for k in range(121)])
+    replay = FlightReplay(str(path))
+    try:
+        assert replay.count == 301
+        assert replay.end_time == pytest.approx(5.0)
+        assert replay.sample(4.5)['pos_x'] == pytest.approx(4.5)
+    finally:
+        replay.close()
+
+
+def test_star_seed_round_trip(tmp_path):
+    path = tmp_path / "seeded.tlm"
+    record_flight(path, [0.0, 1.0], star_seed=2**32 - 1)
+    replay = FlightReplay(str(path))
+    try:
+        assert replay.star_seed == 2**32 - 1
+    finally:
+        replay.close()
@@ -0,0 +1,32 @@
+import random
+
+import pytest
+
+from Spacecraft import Spacecraft, PITCH_LIMIT
+
+
+def test_rolled_pitch_input_does_not_flip_over_the_pole():
+    ship = Spacecraft(0, 0, 0)
+    ship.set_euler(0, -85, 180)
+    ship.rotate(0, 10, 0)
+    assert abs(ship.pitch) <= PITCH_LIMIT + 1e-6
+    assert abs(ship.yaw) < 1e-6  # No 180 degree yaw snap
+
+
+def test_pitch_input_never_passes_the_limit():
+    rng = random.Random(1)
+    for _ in range(300):
+        ship = Spacecraft(0, 0, 0)
+        ship.set_euler(rng.uniform(-180, 180), rng.uniform(-89, 89), rng.uniform(-180, 180))
+        for _ in range(20):
+            ship.rotate(rng.uniform(-5, 5), rng.uniform(-40, 40), rng.uniform(-10, 10))
+            assert abs(ship.pitch) <= PITCH_LIMIT + 1e-6
+
+
+def test_pitch_can_move_back_from_the_limit():
+    ship = Spacecraft(0, 0, 0)
+    ship.set_euler(0, 89, 0)
+    ship.rotate(0, 5, 0)
+    assert ship.pitch == pytest.approx(89)
+    ship.rotate(0, -5, 0)
+    assert ship.pitch == pytest.approx(84)
@@ -0,0 +1,94 @@
+import pickle
+import random
+
+import pytest
+
+import MatrixMath
+from MatrixMath import Vector3, Vector3Array, Matrix4
+
+
+@pytest.fixture(params=["python", "numpy"])
+def backend(request):
+    # Run every case against both backends, restoring the global choice
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    saved = MatrixMath._backend
+    yield MatrixMath.set_backend(request.param)
+    MatrixMath._backend = saved
+
+
+def make_vectors(seed, count=20):
+    rng = random.Random(seed)
+    vectors = [Vector3(rng.uniform(-5, 5), rng.uniform(-5, 5), rng.uniform(-5, 5))
+               for _ in range(count)]
+    vectors.append(Vector3())  # Zero length element
+    return vectors
+
+
+def assert_vectors(array, expected):
+    assert len(array) == len(expected)
+    for got, want in zip(array, expected):
+        assert got.x == pytest.approx(want.x)
+        assert got.y == pytest.approx(want.y)
+        assert got.z == pytest.approx(want.z)
+
+
+def assert_values(column, expected):
+    assert list(column) == pytest.approx(expected)
+
+
+def test_add_sub(backend):
+    a, b = make_vectors(1), make_vectors(2)
+    arr_a, arr_b = Vector3Array.from_vectors(a), Vector3Array.from_vectors(b)
+    assert arr_a.backend.name == backend.name
+    assert_vectors(arr_a + arr_b, [p + q for p, q in zip(a, b)])
+    assert_vectors(arr_a - arr_b, [p - q for p, q in zip(a, b)])
+    assert_vectors(arr_a + b[0], [p + b[0] for p in a])
+    assert_vectors(arr_a - b[0], [p - b[0] for p in a])
+
+
+def test_scale(backend):
+    a = make_vectors(3)
+    assert_vectors(Vector3Array.from_vectors(a) * 2.5, [p * 2.5 for p in a])
+
+
+def test_dot_cross(backend):
+    a, b = make_vectors(4), make_vectors(5)
+    arr_a, arr_b = Vector3Array.from_vectors(a), Vector3Array.from_vectors(b)
+    assert_values(arr_a.dot(arr_b), [p.dot(q) for p, q in zip(a, b)])
+    assert_values(arr_a.dot(b[0]), [p.dot(b[0]) for p in a])
+    assert_vectors(arr_a.cross(arr_b), [p.cross(q) for p, q in zip(a, b)])
+    assert_vectors(arr_a.cross(b[0]), [p.cross(b[0]) for p in a])
+
+
+def test_magnitude_normalize(backend):
+    a = make_vectors(6)
+    arr = Vector3Array.from_vectors(a)
+    assert_values(arr.magnitude(), [p.magnitude() for p in a])
+    # Zero length elements stay zero, like Vector3.normalize
+    assert_vectors(arr.normalize(), [p.normalize() for p in a])
+
+
+def test_transform(backend):
+    a = make_vectors(7)
+    arr = Vector3Array.from_vectors(a)
+    model = Matrix4.make_translation(1, 2, 3) @ Matrix4.make_rotation_y(20)
+    proj = Matrix4.make_projection(90.0, 0.8, 0.1, 1000.0)
+
+    for matrix in (model, proj @ model):
+        result = arr.transform(matrix)
+        expected = [matrix.multiply_vector(p) for p in a]
+        assert_vectors(result, expected)
+        assert_values(result.w, [p.w for p in expected])
+
+    # w=0: directions ignore translation
+    directions = arr.transform(model, w=0.0)
+    assert_vectors(directions, [model.multiply_vector(Vector3(p.x, p.y, p.z)) - Vector3(1, 2, 3)
+                                for p in a])
+
+
+def test_pickle_round_trip(backend):
+    a = make_vectors(8)
+    restored = pickle.loads(pickle.dumps(Vector3Array.from_vectors(a)))
+    assert restored.backend.name == backend.name
+    assert_vectors(restored, a)